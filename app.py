@@ -1,8 +1,43 @@
-from fastapi import FastAPI
+from contextlib import asynccontextmanager
+
+from fastapi import Depends, FastAPI
+from fastapi.responses import PlainTextResponse
 
 from config.settings import settings
 from routes import bugs, projects, users
-from utils.db import init_db
+from utils.bug_feed import bug_feed
+from utils.db import close_db, init_db
+from utils.history import history_writer
+from utils.instrumentation import (
+    InstrumentationMiddleware,
+    SlowRequestProfiler,
+    register_stats,
+    render_metrics,
+)
+from utils.notifications import notifier
+from utils.password import password_pool
+from utils.principal_cache import principal_cache, user_id_cache
+from utils.purger import purger
+from utils.rate_limit import rate_limiter
+from utils.revocation import revocation_list
+from utils.serialization import ORJSONResponse
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    await init_db()
+    await revocation_list.start()
+    await notifier.start()
+    await purger.start()
+    await history_writer.start()
+    yield
+    await purger.stop()
+    await bug_feed.stop()
+    await history_writer.stop()
+    await revocation_list.stop()
+    await notifier.stop()
+    password_pool.shutdown()
+    await close_db()
 
 
 def create_app() -> FastAPI:
@@ -10,20 +45,46 @@ def create_app() -> FastAPI:
         title="Bug Tracker API",
         version="0.1.0",
         description="API for bug tracker frontend",
+        lifespan=lifespan,
+        default_response_class=ORJSONResponse,
+        dependencies=[Depends(rate_limiter)],
     )
     app.include_router(users.router)
     app.include_router(projects.router)
     app.include_router(bugs.router)
 
+    if settings.METRICS_ENABLED:
+        profiler = None
+        if settings.SLOW_REQUEST_PROFILE_MS:
+            profiler = SlowRequestProfiler(
+                threshold=settings.SLOW_REQUEST_PROFILE_MS / 1000,
+                interval=settings.PROFILER_INTERVAL_MS / 1000,
+            )
+        app.add_middleware(InstrumentationMiddleware, profiler=profiler)
+        app.add_api_route(
+            "/metrics",
+            metrics,
+            response_class=PlainTextResponse,
+            include_in_schema=False,
+        )
+        register_stats("principal_cache", principal_cache.stats)
+        register_stats("user_id_cache", user_id_cache.stats)
+        register_stats("password_pool", password_pool.stats)
+        register_stats("notifications", notifier.stats)
+        register_stats("project_purger", purger.stats)
+        register_stats("bug_feed", bug_feed.stats)
+        register_stats("revocation_list", revocation_list.stats)
+        register_stats("rate_limiter", rate_limiter.stats)
+        register_stats("history_writer", history_writer.stats)
+
     return app
 
 
-app = create_app()
+async def metrics():
+    return PlainTextResponse(render_metrics(), media_type="text/plain; version=0.0.4")
 
 
-@app.on_event("startup")
-async def startup_event():
-    await init_db()
+app = create_app()
 
 
 @app.get("/")
@@ -0,0 +1,27 @@
+import os
+
+DEFAULT_ENV = {
+    "HOST": "127.0.0.1",
+    "PORT": "8000",
+    "MONGODB_URL": "mongodb://localhost:27017",
+    "MONGODB_DB_NAME": "bug_tracker_bench",
+    "JWT_SECRET_KEY": "benchmark",
+    "ACCESS_TOKEN_EXPIRE_MINUTES": "30",
+    "TELEGRAM_TOKEN": "000:benchmark",
+    "TELEGRAM_CHAT_ID": "0",
+    "NOTIFICATION_QUEUE_SIZE": "1000000",
+    "QUERY_PLAN_CHECK": "off",
+    "RATE_LIMIT_BACKEND": "none",
+}
+
+
+def apply_default_env(**overrides: str) -> None:
+    for key, value in DEFAULT_ENV.items():
+        os.environ.setdefault(key, value)
+    os.environ.update(overrides)
+
+
+def percentile(samples: list[float], pct: float) -> float:
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
@@ -0,0 +1,316 @@
+"""Mixed-workload benchmark for the bug tracker API.
+
+    python -m benchmarks.harness                      # mongomock-motor, in-process
+    python -m benchmarks.harness --mongodb-url mongodb://localhost:27017
+    python -m benchmarks.harness --save-baseline benchmarks/baselines/mongomock.json
+    python -m benchmarks.harness --baseline benchmarks/baselines/mongomock.json
+
+The app is driven in-process through httpx. Mongo ops per request are only
+reported against a real mongod, where a pymongo CommandListener can count them.
+"""
+import argparse
+import asyncio
+import json
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Any, Optional
+
+from benchmarks.common import apply_default_env, percentile
+
+WORKLOADS = ("login", "poll", "detail", "write", "mixed")
+
+
+class Workload:
+    def __init__(self, http: Any, seed: dict, rng: random.Random) -> None:
+        self.http = http
+        self.seed = seed
+        self.rng = rng
+
+    async def login(self) -> Any:
+        return await self.http.post(
+            "/users/access-token",
+            data={"username": self.seed["login_email"], "password": "password"},
+        )
+
+    async def poll(self) -> Any:
+        project_id = self.rng.choice(self.seed["project_ids"])
+        return await self.http.get(
+            f"/bugs/projects/{project_id}",
+            params={"limit": 20},
+            headers=self.seed["developer_headers"],
+        )
+
+    async def detail(self) -> Any:
+        bug_id = self.rng.choice(self.seed["bug_ids"])
+        return await self.http.get(
+            f"/bugs/{bug_id}", headers=self.seed["developer_headers"]
+        )
+
+    async def write(self) -> Any:
+        if self.rng.random() < 0.5:
+            return await self.http.post(
+                "/bugs/",
+                json={
+                    "title": "benchmark bug",
+                    "description": "created by the benchmark harness",
+                    "severity": self.rng.choice(["low", "medium", "high"]),
+                    "status": "open",
+                    "project_id": self.rng.choice(self.seed["project_ids"]),
+                    "assigned_to": [self.seed["developer_id"]],
+                },
+                headers=self.seed["manager_headers"],
+            )
+        return await self.http.put(
+            f"/bugs/{self.rng.choice(self.seed['bug_ids'])}",
+            json={"status": self.rng.choice(["open", "closed", "underdevelopment"])},
+            headers=self.seed["manager_headers"],
+        )
+
+    async def mixed(self) -> Any:
+        roll = self.rng.random()
+        if roll < 0.02:
+            return await self.login()
+        if roll < 0.6:
+            return await self.poll()
+        if roll < 0.9:
+            return await self.detail()
+        return await self.write()
+
+
+async def connect(args: argparse.Namespace) -> Optional[Any]:
+    from beanie import init_beanie
+
+    from models import gather_models
+
+    if args.mongodb_url:
+        from motor.motor_asyncio import AsyncIOMotorClient
+        from pymongo import monitoring
+
+        class CommandCounter(monitoring.CommandListener):
+            count = 0
+
+            def started(self, event: monitoring.CommandStartedEvent) -> None:
+                self.count += 1
+
+            def succeeded(self, event: monitoring.CommandSucceededEvent) -> None:
+                pass
+
+            def failed(self, event: monitoring.CommandFailedEvent) -> None:
+                pass
+
+        counter = CommandCounter()
+        client = AsyncIOMotorClient(args.mongodb_url, event_listeners=[counter])
+        await client.drop_database(args.database)
+        database = client[args.database]
+    else:
+        from mongomock_motor import AsyncMongoMockClient
+
+        counter = None
+        database = AsyncMongoMockClient()[args.database]
+    await init_beanie(database=database, document_models=gather_models())
+    return counter
+
+
+async def seed_data(args: argparse.Namespace) -> dict:
+    from beanie import PydanticObjectId
+
+    from models.bugs import Bug
+    from models.projects import Project
+    from models.users import User
+    from utils.password import hash_password
+    from utils.security import create_access_token
+
+    hashed = hash_password("password")
+    manager = await User(
+        email="manager@bench.example.com", hashed_password=hashed, role="manager"
+    ).insert()
+    developer = await User(
+        email="developer@bench.example.com", hashed_password=hashed, role="developer"
+    ).insert()
+    if args.users > 2:
+        await User.insert_many(
+            [
+                User(email=f"user{i}@bench.example.com", hashed_password=hashed)
+                for i in range(args.users - 2)
+            ]
+        )
+    projects = [
+        Project(
+            id=PydanticObjectId(),
+            name=f"project {i}",
+            description="benchmark project",
+            created_by=manager.id,
+        )
+        for i in range(args.projects)
+    ]
+    await Project.insert_many(projects)
+
+    rng = random.Random(args.seed)
+    bug_ids = []
+    for project in projects:
+        bugs = [
+            Bug(
+                id=PydanticObjectId(),
+                title=f"bug {i}",
+                description="x" * rng.randint(50, 500),
+                severity=rng.choice(["low", "medium", "high"]),
+                status=rng.choice(["open", "closed", "underdevelopment"]),
+                project_id=project.id,
+                assigned_to=[developer.id],
+                created_by=manager.id,
+            )
+            for i in range(args.bugs_per_project)
+        ]
+        await Bug.insert_many(bugs)
+        bug_ids.extend(str(bug.id) for bug in bugs)
+
+    def headers(user: User) -> dict:
+        token = create_access_token(sub=user.email)
+        return {"Authorization": f"Bearer {token}"}
+
+    return {
+        "login_email": developer.email,
+        "developer_id": str(developer.id),
+        "developer_headers": headers(developer),
+        "manager_headers": headers(manager),
+        "project_ids": [str(project.id) for project in projects],
+        "bug_ids": bug_ids,
+    }
+
+
+async def drive(
+    name: str, workload: Workload, counter: Optional[Any], args: argparse.Namespace
+) -> dict:
+    operation = getattr(workload, name)
+    latencies: list[float] = []
+    errors = 0
+    ops_before = counter.count if counter else 0
+    deadline = time.perf_counter() + args.duration
+
+    async def worker() -> None:
+        nonlocal errors
+        while time.perf_counter() < deadline:
+            started = time.perf_counter()
+            response = await operation()
+            latencies.append(time.perf_counter() - started)
+            if response.status_code >= 400:
+                errors += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(args.concurrency)))
+    elapsed = time.perf_counter() - started
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "throughput": len(latencies) / elapsed,
+        "p50_ms": statistics.median(latencies) * 1000,
+        "p95_ms": percentile(latencies, 95) * 1000,
+        "p99_ms": percentile(latencies, 99) * 1000,
+        "mongo_ops_per_request": (
+            (counter.count - ops_before) / len(latencies) if counter else None
+        ),
+    }
+
+
+def compare(results: dict, baseline: dict, tolerance: float) -> list[str]:
+    regressions = []
+    for name, result in results.items():
+        expected = baseline.get(name)
+        if not expected:
+            continue
+        if result["p95_ms"] > expected["p95_ms"] * (1 + tolerance):
+            regressions.append(
+                f"{name}: p95 {result['p95_ms']:.1f}ms > baseline {expected['p95_ms']:.1f}ms"
+            )
+        if result["throughput"] < expected["throughput"] * (1 - tolerance):
+            regressions.append(
+                f"{name}: throughput {result['throughput']:.1f}/s < baseline {expected['throughput']:.1f}/s"
+            )
+        ops, expected_ops = result["mongo_ops_per_request"], expected.get(
+            "mongo_ops_per_request"
+        )
+        if ops is not None and expected_ops is not None and ops > expected_ops + 0.05:
+            regressions.append(
+                f"{name}: {ops:.2f} Mongo ops/request > baseline {expected_ops:.2f}"
+            )
+    return regressions
+
+
+async def run(args: argparse.Namespace) -> dict:
+    import httpx
+
+    from app import create_app
+    from utils.password import password_pool
+
+    counter = await connect(args)
+    seed = await seed_data(args)
+    results = {}
+    async with httpx.AsyncClient(app=create_app(), base_url="http://bench") as http:
+        workload = Workload(http, seed, random.Random(args.seed))
+        for name in args.workloads:
+            results[name] = await drive(name, workload, counter, args)
+    password_pool.shutdown()
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--mongodb-url", help="benchmark a real mongod instead")
+    parser.add_argument("--database", default="bug_tracker_bench")
+    parser.add_argument("--users", type=int, default=100)
+    parser.add_argument("--projects", type=int, default=20)
+    parser.add_argument("--bugs-per-project", type=int, default=200)
+    parser.add_argument("--workloads", nargs="+", choices=WORKLOADS, default=WORKLOADS)
+    parser.add_argument("--duration", type=float, default=5.0)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--response-cache", default="none")
+    parser.add_argument("--baseline", type=Path)
+    parser.add_argument("--save-baseline", type=Path)
+    parser.add_argument("--tolerance", type=float, default=0.25)
+    args = parser.parse_args()
+    apply_default_env(RESPONSE_CACHE_BACKEND=args.response_cache)
+
+    results = asyncio.run(run(args))
+
+    print(
+        f"{'workload':<8} {'reqs':>7} {'err':>5} {'req/s':>8} {'p50 ms':>8} "
+        f"{'p95 ms':>8} {'p99 ms':>8} {'ops/req':>8}"
+    )
+    for name, r in results.items():
+        ops = r["mongo_ops_per_request"]
+        print(
+            f"{name:<8} {r['requests']:>7} {r['errors']:>5} {r['throughput']:>8.1f} "
+            f"{r['p50_ms']:>8.2f} {r['p95_ms']:>8.2f} {r['p99_ms']:>8.2f} "
+            f"{'n/a' if ops is None else f'{ops:.2f}':>8}"
+        )
+
+    config = {
+        key: getattr(args, key)
+        for key in ("users", "projects", "bugs_per_project", "concurrency", "seed")
+    }
+    config["backend"] = "mongod" if args.mongodb_url else "mongomock"
+    if args.save_baseline:
+        args.save_baseline.parent.mkdir(parents=True, exist_ok=True)
+        args.save_baseline.write_text(
+            json.dumps({"config": config, "workloads": results}, indent=2) + "\n"
+        )
+    if args.baseline:
+        baseline = json.loads(args.baseline.read_text())
+        if baseline["config"] != config:
+            print(
+                f"warning: baseline was recorded with {baseline['config']}",
+                file=sys.stderr,
+            )
+        regressions = compare(results, baseline["workloads"], args.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION {regression}", file=sys.stderr)
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
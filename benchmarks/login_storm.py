@@ -0,0 +1,91 @@
+"""Latency of an unrelated endpoint while /users/access-token is under load.
+
+    python -m benchmarks.login_storm --workers 4
+    python -m benchmarks.login_storm --workers 0  # hash inline on the event loop
+
+Runs in-process against mongomock-motor (pip install mongomock-motor).
+"""
+import argparse
+import asyncio
+import statistics
+import time
+
+from benchmarks.common import apply_default_env, percentile
+
+
+async def run(args: argparse.Namespace) -> dict:
+    import httpx
+    from beanie import init_beanie
+    from mongomock_motor import AsyncMongoMockClient
+
+    from app import create_app
+    from models import gather_models
+    from models.users import User
+    from utils.password import hash_password, password_pool
+
+    client = AsyncMongoMockClient()
+    await init_beanie(database=client["bench"], document_models=gather_models())
+    await User(
+        email="storm@example.com", hashed_password=hash_password("password")
+    ).insert()
+
+    app = create_app()
+    deadline = time.perf_counter() + args.duration
+    logins = 0
+    probe_latencies: list[float] = []
+
+    async with httpx.AsyncClient(app=app, base_url="http://bench") as http:
+
+        async def login_worker() -> None:
+            nonlocal logins
+            while time.perf_counter() < deadline:
+                response = await http.post(
+                    "/users/access-token",
+                    data={"username": "storm@example.com", "password": "password"},
+                )
+                response.raise_for_status()
+                logins += 1
+
+        async def probe() -> None:
+            while time.perf_counter() < deadline:
+                due = time.perf_counter() + args.probe_interval
+                await asyncio.sleep(args.probe_interval)
+                await http.get("/")
+                probe_latencies.append(time.perf_counter() - due)
+
+        await asyncio.gather(
+            probe(), *(login_worker() for _ in range(args.concurrency))
+        )
+
+    password_pool.shutdown()
+    return {
+        "workers": args.workers,
+        "concurrency": args.concurrency,
+        "logins_per_second": logins / args.duration,
+        "probe_p50_ms": statistics.median(probe_latencies) * 1000,
+        "probe_p99_ms": percentile(probe_latencies, 99) * 1000,
+        "probe_max_ms": max(probe_latencies) * 1000,
+        "probe_samples": len(probe_latencies),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--probe-interval", type=float, default=0.01)
+    args = parser.parse_args()
+
+    apply_default_env(PASSWORD_HASH_WORKERS=str(args.workers))
+
+    for key, value in asyncio.run(run(args)).items():
+        print(
+            f"{key:>20}: {value:.2f}"
+            if isinstance(value, float)
+            else f"{key:>20}: {value}"
+        )
+
+
+if __name__ == "__main__":
+    main()
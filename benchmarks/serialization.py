@@ -0,0 +1,161 @@
+"""Serialization cost of bug list responses, legacy encoder vs orjson path.
+
+    python -m benchmarks.serialization --sizes 1000 10000
+    python -m benchmarks.serialization --endpoint  # also time GET /bugs/projects/{id}
+
+The encoder comparison needs no database. --endpoint runs in-process against
+mongomock-motor (pip install mongomock-motor); sizes above the route's page
+limit are fetched with ?stream=true, one project holding exactly that many bugs.
+"""
+import argparse
+import asyncio
+import statistics
+import time
+from datetime import datetime, timedelta
+from typing import Callable
+
+from benchmarks.common import apply_default_env, percentile
+
+PAGE_LIMIT = 1000
+
+
+def make_bugs(count: int) -> list:
+    from beanie import PydanticObjectId
+
+    from schemas import bugs as BugSchema
+
+    project_id = PydanticObjectId()
+    users = [PydanticObjectId() for _ in range(8)]
+    start = datetime.utcnow()
+    return [
+        BugSchema.BugInDBOut(
+            _id=PydanticObjectId(),
+            title=f"Bug {i}",
+            description="Steps to reproduce: open the dashboard and wait. " * 3,
+            severity=("low", "medium", "high")[i % 3],
+            status=("open", "closed", "underdevelopment")[i % 3],
+            project_id=project_id,
+            assigned_to=users[: i % 4],
+            created_at=start + timedelta(milliseconds=i),
+            created_by=users[i % 8],
+        )
+        for i in range(count)
+    ]
+
+
+def time_encoder(encode: Callable[[list], bytes], bugs: list, repeat: int) -> dict:
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        body = encode(bugs)
+        samples.append(time.perf_counter() - started)
+    return {
+        "p50_ms": statistics.median(samples) * 1000,
+        "p99_ms": percentile(samples, 99) * 1000,
+        "bytes": len(body),
+    }
+
+
+def compare_encoders(sizes: list[int], repeat: int) -> list[dict]:
+    from fastapi.encoders import jsonable_encoder
+    from fastapi.responses import JSONResponse
+
+    from utils.serialization import dumps
+
+    encoders = {
+        "jsonable_encoder+json": lambda bugs: JSONResponse(
+            content=jsonable_encoder(bugs)
+        ).body,
+        "orjson": dumps,
+    }
+    results = []
+    for size in sizes:
+        bugs = make_bugs(size)
+        for name, encode in encoders.items():
+            results.append(
+                {"size": size, "encoder": name, **time_encoder(encode, bugs, repeat)}
+            )
+    return results
+
+
+async def time_endpoint(sizes: list[int], repeat: int) -> list[dict]:
+    import httpx
+    from beanie import init_beanie
+    from mongomock_motor import AsyncMongoMockClient
+
+    from app import create_app
+    from models import gather_models
+    from models.bugs import Bug
+    from models.projects import Project
+    from models.users import User
+    from utils.password import hash_password
+    from utils.security import create_access_token
+
+    client = AsyncMongoMockClient()
+    await init_beanie(database=client["bench"], document_models=gather_models())
+    user = await User(
+        email="bench@example.com", hashed_password=hash_password("password")
+    ).insert()
+    projects = {}
+    for size in sizes:
+        project = await Project(
+            name=f"bench-{size}", description="bench", created_by=user.id
+        ).insert()
+        await Bug.insert_many(
+            [
+                Bug(**bug.model_dump(exclude={"id"}) | {"project_id": project.id})
+                for bug in make_bugs(size)
+            ]
+        )
+        projects[size] = project.id
+    headers = {"Authorization": f"Bearer {create_access_token(user.email)}"}
+
+    results = []
+    async with httpx.AsyncClient(app=create_app(), base_url="http://bench") as http:
+        for size in sizes:
+            samples = []
+            params = {"limit": size} if size <= PAGE_LIMIT else {"stream": "true"}
+            for _ in range(repeat):
+                started = time.perf_counter()
+                response = await http.get(
+                    f"/bugs/projects/{projects[size]}",
+                    params=params,
+                    headers=headers,
+                )
+                response.raise_for_status()
+                samples.append(time.perf_counter() - started)
+            results.append(
+                {
+                    "size": size,
+                    "encoder": "endpoint" if "limit" in params else "endpoint ndjson",
+                    "p50_ms": statistics.median(samples) * 1000,
+                    "p99_ms": percentile(samples, 99) * 1000,
+                    "bytes": len(response.content),
+                }
+            )
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000])
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--endpoint", action="store_true")
+    args = parser.parse_args()
+
+    apply_default_env(RESPONSE_CACHE_BACKEND="none")
+
+    results = compare_encoders(args.sizes, args.repeat)
+    if args.endpoint:
+        results += asyncio.run(time_endpoint(args.sizes, args.repeat))
+
+    print(f"{'size':>6} {'encoder':>22} {'p50_ms':>9} {'p99_ms':>9} {'bytes':>10}")
+    for row in results:
+        print(
+            f"{row['size']:>6} {row['encoder']:>22} {row['p50_ms']:>9.2f} "
+            f"{row['p99_ms']:>9.2f} {row['bytes']:>10}"
+        )
+
+
+if __name__ == "__main__":
+    main()
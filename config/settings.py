@@ -1,3 +1,5 @@
+from typing import Literal, Optional
+
 from pydantic_settings import BaseSettings
 
 
@@ -7,10 +9,82 @@ class Settings(BaseSettings):
     DEBUG: bool = True
     MONGODB_URL: str
     MONGODB_DB_NAME: str
+    MONGODB_MAX_POOL_SIZE: int = 100
+    MONGODB_MIN_POOL_SIZE: int = 0
+    MONGODB_WAIT_QUEUE_TIMEOUT_MS: Optional[int] = None
+    MONGODB_SERVER_SELECTION_TIMEOUT_MS: int = 30_000
+    MONGODB_CONNECT_TIMEOUT_MS: int = 20_000
+    MONGODB_SOCKET_TIMEOUT_MS: Optional[int] = None
+    MONGODB_MAX_IDLE_TIME_MS: Optional[int] = None
+    MONGODB_COMPRESSORS: Optional[str] = None
+    MONGODB_READ_PREFERENCE: Literal[
+        "primary", "primaryPreferred", "secondary", "secondaryPreferred", "nearest"
+    ] = "primary"
+    MONGODB_MAX_STALENESS_SECONDS: Optional[int] = None
+    READ_YOUR_WRITES_WINDOW_SECONDS: float = 300
+    READ_YOUR_WRITES_BACKEND: Literal["memory", "redis"] = "memory"
     JWT_SECRET_KEY: str
     ACCESS_TOKEN_EXPIRE_MINUTES: int
+    REFRESH_TOKEN_EXPIRE_DAYS: int = 14
+    REVOCATION_SYNC_SECONDS: float = 5
+    REVOCATION_BLOOM_CAPACITY: int = 100_000
+    REVOCATION_BLOOM_ERROR_RATE: float = 0.001
     TELEGRAM_TOKEN: str
     TELEGRAM_CHAT_ID: str
+    TELEGRAM_API_URL: str = "https://api.telegram.org"
+    TELEGRAM_PARSE_MODE: Optional[str] = "MarkdownV2"
+    NOTIFICATION_QUEUE_SIZE: int = 1000
+    NOTIFICATION_COALESCE_SECONDS: float = 2.0
+    NOTIFICATION_MIN_INTERVAL_SECONDS: float = 1.0
+    NOTIFICATION_MAX_RETRIES: int = 5
+    PRINCIPAL_CACHE_TTL_SECONDS: float = 60
+    PRINCIPAL_CACHE_MAX_SIZE: int = 10_000
+    USER_ID_CACHE_TTL_SECONDS: float = 30
+    ARGON2_TIME_COST: int = 3
+    ARGON2_MEMORY_COST: int = 65536
+    ARGON2_PARALLELISM: int = 4
+    PASSWORD_HASH_EXECUTOR: Literal["thread", "process"] = "thread"
+    PASSWORD_HASH_WORKERS: int = 4
+    QUERY_PLAN_CHECK: Literal["off", "warn", "fail"] = "warn"
+    REDIS_URL: str = "redis://localhost:6379/0"
+    RESPONSE_CACHE_BACKEND: Literal["memory", "redis", "none"] = "memory"
+    RESPONSE_CACHE_TTL_SECONDS: int = 30
+    RESPONSE_CACHE_MAX_ENTRIES: int = 10_000
+    BULK_MAX_ITEMS: int = 1000
+    BUG_DETAIL_READ_MODEL: bool = False
+    RATE_LIMIT_BACKEND: Literal["memory", "redis", "none"] = "memory"
+    RATE_LIMITS: dict[str, str] = {
+        "POST /users/access-token": "10/minute",
+        "POST /users/signup": "10/hour",
+        "POST /users/refresh-token": "30/minute",
+        "POST /bugs/": "60/minute",
+        "POST /bugs/bulk": "10/minute",
+        "PATCH /bugs/bulk": "10/minute",
+        "GET /projects/{project_id}/export": "10/hour",
+        "POST /projects/import": "10/hour",
+    }
+    RATE_LIMIT_DEFAULT: Optional[str] = None
+    RATE_LIMIT_SHARDS: int = 16
+    RATE_LIMIT_MAX_KEYS: int = 100_000
+    SEARCH_BACKEND: Literal["mongo", "memory"] = "mongo"
+    BUG_FEED_QUEUE_SIZE: int = 100
+    BUG_FEED_KEEPALIVE_SECONDS: float = 15
+    BUG_FEED_PRE_IMAGES: bool = False
+    HISTORY_QUEUE_SIZE: int = 10_000
+    HISTORY_BATCH_SIZE: int = 500
+    HISTORY_FLUSH_SECONDS: float = 0.5
+    HISTORY_BUCKET_MAX_EVENTS: int = 200
+    PURGE_BATCH_SIZE: int = 500
+    PURGE_BATCH_PAUSE_SECONDS: float = 0.05
+    PURGE_LEASE_SECONDS: float = 60
+    PURGE_POLL_SECONDS: float = 30
+    PURGE_PENDING_CACHE_SECONDS: float = 5
+    TRANSFER_BATCH_SIZE: int = 1000
+    TRANSFER_CHUNK_BYTES: int = 64 * 1024
+    TRANSFER_MAX_LINE_BYTES: int = 1024 * 1024
+    METRICS_ENABLED: bool = True
+    SLOW_REQUEST_PROFILE_MS: Optional[float] = None
+    PROFILER_INTERVAL_MS: float = 5
 
     class Config:
         env_file = ".env"
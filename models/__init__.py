@@ -1,7 +1,21 @@
+from .bug_details import BugDetail
+from .bug_history import BugHistory
 from .bugs import Bug
+from .project_stats import ProjectStats
 from .projects import Project
+from .purge_jobs import PurgeJob
+from .revoked_tokens import RevokedToken
 from .users import User
 
 
 def gather_models():
-    return [User, Project, Bug]
+    return [
+        User,
+        Project,
+        Bug,
+        BugDetail,
+        BugHistory,
+        ProjectStats,
+        PurgeJob,
+        RevokedToken,
+    ]
@@ -0,0 +1,71 @@
+from datetime import datetime
+from typing import Literal
+
+from beanie import Document, PydanticObjectId
+from pydantic import BaseModel, ConfigDict, Field
+from pymongo import ASCENDING, IndexModel
+
+
+class AssigneeSummary(BaseModel):
+    id: PydanticObjectId = Field(..., alias="_id")
+    email: str
+    role: str
+    model_config = ConfigDict(populate_by_name=True)
+
+
+class ProjectSummary(BaseModel):
+    id: PydanticObjectId = Field(..., alias="_id")
+    name: str
+    description: str
+    created_at: datetime
+    model_config = ConfigDict(populate_by_name=True)
+
+
+class BugDetail(Document):
+    title: str
+    description: str
+    severity: Literal["low", "medium", "high"]
+    status: Literal["open", "closed", "underdevelopment"]
+    project_id: PydanticObjectId
+    project: list[ProjectSummary]
+    assigned_to: list[AssigneeSummary]
+
+    class Settings:
+        indexes = [
+            IndexModel([("assigned_to._id", ASCENDING)], name="assignee"),
+            IndexModel([("project._id", ASCENDING)], name="project"),
+        ]
+
+    @classmethod
+    async def sync_user(cls, *, user_id: PydanticObjectId, email: str, role: str):
+        await cls.get_motor_collection().update_many(
+            {"assigned_to._id": user_id},
+            {
+                "$set": {
+                    "assigned_to.$[user].email": email,
+                    "assigned_to.$[user].role": role,
+                }
+            },
+            array_filters=[{"user._id": user_id}],
+        )
+
+    @classmethod
+    async def remove_user(cls, *, user_id: PydanticObjectId):
+        await cls.get_motor_collection().update_many(
+            {"assigned_to._id": user_id}, {"$pull": {"assigned_to": {"_id": user_id}}}
+        )
+
+    @classmethod
+    async def sync_project(
+        cls, *, project_id: PydanticObjectId, name: str, description: str
+    ):
+        await cls.get_motor_collection().update_many(
+            {"project._id": project_id},
+            {
+                "$set": {
+                    "project.$[project].name": name,
+                    "project.$[project].description": description,
+                }
+            },
+            array_filters=[{"project._id": project_id}],
+        )
@@ -0,0 +1,87 @@
+from datetime import datetime
+from typing import Literal, Optional, Union
+
+from beanie import Document, PydanticObjectId
+from pydantic import BaseModel, Field
+from pymongo import ASCENDING, IndexModel
+
+from utils.query_plans import register_query_shape
+
+TrackedValue = Optional[Union[str, list[PydanticObjectId]]]
+
+
+class HistoryEvent(BaseModel):
+    id: PydanticObjectId = Field(default_factory=PydanticObjectId, alias="_id")
+    at: datetime
+    op: Literal["create", "update", "delete"]
+    by: PydanticObjectId
+    changes: dict[str, tuple[TrackedValue, TrackedValue]] = Field(default_factory=dict)
+
+
+def bucket_of(at: datetime) -> datetime:
+    return at.replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+class BugHistory(Document):
+    bug_id: PydanticObjectId
+    project_id: PydanticObjectId
+    bucket_start: datetime
+    size: int = 0
+    events: list[HistoryEvent] = Field(default_factory=list)
+
+    class Settings:
+        indexes = [
+            IndexModel(
+                [("bug_id", ASCENDING), ("bucket_start", ASCENDING)],
+                name="bug_bucket",
+            ),
+            IndexModel(
+                [("project_id", ASCENDING), ("bucket_start", ASCENDING)],
+                name="project_bucket",
+            ),
+        ]
+
+
+def transitions_pipeline(
+    project_id: PydanticObjectId, start: datetime, end: datetime
+) -> list[dict]:
+    return [
+        {
+            "$match": {
+                "project_id": project_id,
+                "bucket_start": {"$gte": bucket_of(start), "$lt": end},
+            }
+        },
+        {"$unwind": "$events"},
+        {"$match": {"events.at": {"$gte": start, "$lt": end}}},
+        {
+            "$project": {
+                "op": "$events.op",
+                "changes": {"$objectToArray": "$events.changes"},
+            }
+        },
+        {"$unwind": "$changes"},
+        {"$match": {"changes.k": {"$in": ["status", "severity"]}}},
+        {
+            "$group": {
+                "_id": {
+                    "field": "$changes.k",
+                    "from": {"$arrayElemAt": ["$changes.v", 0]},
+                    "to": {"$arrayElemAt": ["$changes.v", 1]},
+                },
+                "count": {"$sum": 1},
+            }
+        },
+        {"$sort": {"count": -1}},
+    ]
+
+
+_sample_id = PydanticObjectId()
+register_query_shape(
+    "bug history", BugHistory, {"bug_id": _sample_id}, [("bucket_start", ASCENDING)]
+)
+register_query_shape(
+    "project history range",
+    BugHistory,
+    {"project_id": _sample_id, "bucket_start": {"$gte": datetime.utcnow()}},
+)
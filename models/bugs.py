@@ -1,9 +1,92 @@
 from datetime import datetime
-from typing import Literal, Optional
+from typing import Collection, Literal, Optional
 
-from beanie import Document, PydanticObjectId
-from beanie.operators import In
+from beanie import (
+    Delete,
+    Document,
+    Insert,
+    PydanticObjectId,
+    Replace,
+    Save,
+    SaveChanges,
+    Update,
+    after_event,
+)
+from beanie.odm.utils.parsing import parse_obj
 from pydantic import Field
+from pymongo import ASCENDING, TEXT, IndexModel, ReturnDocument
+
+from config.settings import settings
+from utils.consistency import active_session
+from utils.query_plans import register_query_shape
+from utils.search import SEARCH_WEIGHTS, search_index
+
+from .bug_details import BugDetail
+
+
+def bug_detail_pipeline() -> list[dict]:
+    return [
+        {
+            "$lookup": {
+                "from": "User",
+                "localField": "assigned_to",
+                "foreignField": "_id",
+                "as": "assigned_to",
+            }
+        },
+        {
+            "$lookup": {
+                "from": "Project",
+                "localField": "project_id",
+                "foreignField": "_id",
+                "as": "project",
+            }
+        },
+        {
+            "$project": {
+                "title": 1,
+                "description": 1,
+                "severity": 1,
+                "status": 1,
+                "project_id": 1,
+                "assigned_to": {
+                    "$map": {
+                        "input": "$assigned_to",
+                        "as": "user",
+                        "in": {
+                            "_id": "$$user._id",
+                            "email": "$$user.email",
+                            "role": "$$user.role",
+                        },
+                    }
+                },
+                "project": {
+                    "$map": {
+                        "input": "$project",
+                        "as": "project",
+                        "in": {
+                            "_id": "$$project._id",
+                            "name": "$$project.name",
+                            "description": "$$project.description",
+                            "created_at": "$$project.created_at",
+                        },
+                    }
+                },
+            }
+        },
+    ]
+
+
+def bug_search_pipeline(
+    query: str, project_ids: list[PydanticObjectId], after: dict, limit: int
+) -> list[dict]:
+    return [
+        {"$match": {"$text": {"$search": query}, "project_id": {"$in": project_ids}}},
+        {"$addFields": {"score": {"$meta": "textScore"}}},
+        {"$match": after},
+        {"$sort": {"score": -1, "_id": -1}},
+        {"$limit": limit},
+    ]
 
 
 class Bug(Document):
@@ -16,9 +99,157 @@ class Bug(Document):
     created_at: datetime = Field(default_factory=datetime.utcnow)
     created_by: PydanticObjectId
 
+    class Settings:
+        indexes = [
+            IndexModel(
+                [
+                    ("project_id", ASCENDING),
+                    ("created_at", ASCENDING),
+                    ("_id", ASCENDING),
+                ],
+                name="project_created",
+            ),
+            IndexModel(
+                [
+                    ("project_id", ASCENDING),
+                    ("status", ASCENDING),
+                    ("severity", ASCENDING),
+                    ("created_at", ASCENDING),
+                    ("_id", ASCENDING),
+                ],
+                name="project_status_severity_created",
+            ),
+            IndexModel(
+                [
+                    ("assigned_to", ASCENDING),
+                    ("created_at", ASCENDING),
+                    ("_id", ASCENDING),
+                ],
+                name="assigned_to_created",
+            ),
+            IndexModel(
+                [
+                    ("created_by", ASCENDING),
+                    ("created_at", ASCENDING),
+                    ("_id", ASCENDING),
+                ],
+                name="created_by_created",
+            ),
+            IndexModel(
+                [(field, TEXT) for field in SEARCH_WEIGHTS],
+                name="search_text",
+                weights=SEARCH_WEIGHTS,
+            ),
+        ]
+
+    @classmethod
+    async def update_as_editor(
+        cls,
+        bug_id: PydanticObjectId,
+        changes: dict,
+        *,
+        user_id: PydanticObjectId,
+        exclude_projects: Collection[PydanticObjectId] = (),
+        session=None,
+    ) -> Optional["Bug"]:
+        query = {
+            "_id": bug_id,
+            "$or": [{"created_by": user_id}, {"assigned_to": user_id}],
+        }
+        if exclude_projects:
+            query["project_id"] = {"$nin": list(exclude_projects)}
+        document = await cls.get_motor_collection().find_one_and_update(
+            query,
+            {"$set": changes},
+            return_document=ReturnDocument.BEFORE,
+            session=session,
+        )
+        return None if document is None else parse_obj(cls, document)
+
     @classmethod
-    async def is_assigned_to(
-        cls, *, bug_id: PydanticObjectId, user_id: PydanticObjectId
-    ) -> bool:
-        result = await Bug.find_one(In(Bug.assigned_to, [user_id]), Bug.id == bug_id)
-        return result or False
+    async def refresh_details(cls, match: dict, session=None) -> None:
+        pipeline = [
+            {"$match": match},
+            *bug_detail_pipeline(),
+            {
+                "$merge": {
+                    "into": "BugDetail",
+                    "on": "_id",
+                    "whenMatched": "replace",
+                    "whenNotMatched": "insert",
+                }
+            },
+        ]
+        await cls.get_motor_collection().aggregate(pipeline, session=session).to_list(
+            None
+        )
+
+    @classmethod
+    async def rebuild_details(cls) -> None:
+        pipeline = [*bug_detail_pipeline(), {"$out": "BugDetail"}]
+        await cls.get_motor_collection().aggregate(pipeline).to_list(None)
+
+    @classmethod
+    async def rebuild_search_index(cls) -> None:
+        search_index.clear()
+        async for bug in cls.find_all():
+            bug.index_for_search()
+
+    def index_for_search(self) -> None:
+        if settings.SEARCH_BACKEND == "memory":
+            search_index.add(
+                self.id,
+                self.project_id,
+                {field: getattr(self, field) for field in SEARCH_WEIGHTS},
+            )
+
+    @after_event(Insert, Replace, Save, SaveChanges, Update)
+    async def sync_detail(self) -> None:
+        self.index_for_search()
+        if settings.BUG_DETAIL_READ_MODEL:
+            await Bug.refresh_details({"_id": self.id}, session=active_session.get())
+
+    @after_event(Delete)
+    async def drop_detail(self) -> None:
+        search_index.remove(self.id)
+        if settings.BUG_DETAIL_READ_MODEL:
+            await BugDetail.find(BugDetail.id == self.id).delete(
+                session=active_session.get()
+            )
+
+
+_sample_id = PydanticObjectId()
+register_query_shape(
+    "bugs by project",
+    Bug,
+    {"project_id": _sample_id},
+    [("created_at", ASCENDING), ("_id", ASCENDING)],
+)
+register_query_shape(
+    "bugs by project, status and severity",
+    Bug,
+    {"project_id": _sample_id, "status": "open", "severity": "high"},
+    [("created_at", ASCENDING), ("_id", ASCENDING)],
+)
+register_query_shape(
+    "bugs assigned to user",
+    Bug,
+    {"assigned_to": _sample_id},
+    [("created_at", ASCENDING), ("_id", ASCENDING)],
+)
+register_query_shape(
+    "bugs created by user",
+    Bug,
+    {"created_by": _sample_id},
+    [("created_at", ASCENDING), ("_id", ASCENDING)],
+)
+register_query_shape(
+    "project export",
+    Bug,
+    {"project_id": _sample_id},
+    [("created_at", ASCENDING), ("_id", ASCENDING)],
+)
+register_query_shape("bugs of deleted project", Bug, {"project_id": _sample_id})
+register_query_shape(
+    "bug search", Bug, {"$text": {"$search": "sample"}, "project_id": _sample_id}
+)
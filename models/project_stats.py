@@ -0,0 +1,91 @@
+from collections import Counter
+from datetime import datetime
+from typing import Optional
+
+from beanie import Document, PydanticObjectId
+from pydantic import Field
+from pymongo import ReplaceOne, UpdateOne
+
+from .bugs import Bug
+
+STATUSES = ("open", "closed", "underdevelopment")
+SEVERITIES = ("low", "medium", "high")
+
+StatsKey = tuple[PydanticObjectId, str, str]
+
+
+class ProjectStats(Document):
+    counts: dict[str, dict[str, int]] = Field(default_factory=dict)
+    updated_at: Optional[datetime] = Field(default_factory=datetime.utcnow)
+
+    @classmethod
+    async def apply(cls, changes: Counter, session=None) -> None:
+        increments: dict[PydanticObjectId, dict[str, int]] = {}
+        for (project_id, status, severity), delta in changes.items():
+            if delta:
+                increments.setdefault(project_id, {})[
+                    f"counts.{status}.{severity}"
+                ] = delta
+        if not increments:
+            return
+        await cls.get_motor_collection().bulk_write(
+            [
+                UpdateOne(
+                    {"_id": project_id},
+                    {"$inc": inc, "$currentDate": {"updated_at": True}},
+                    upsert=True,
+                )
+                for project_id, inc in increments.items()
+            ],
+            ordered=False,
+            session=session,
+        )
+
+    @classmethod
+    async def reconcile(cls, project_id: Optional[PydanticObjectId] = None) -> None:
+        match = {} if project_id is None else {"project_id": project_id}
+        pipeline = [
+            {"$match": match},
+            {
+                "$group": {
+                    "_id": {
+                        "project_id": "$project_id",
+                        "status": "$status",
+                        "severity": "$severity",
+                    },
+                    "count": {"$sum": 1},
+                }
+            },
+        ]
+        counts: dict[PydanticObjectId, dict[str, dict[str, int]]] = {}
+        async for row in Bug.get_motor_collection().aggregate(pipeline):
+            key = row["_id"]
+            counts.setdefault(key["project_id"], {}).setdefault(key["status"], {})[
+                key["severity"]
+            ] = row["count"]
+
+        if project_id is None:
+            stale = await cls.distinct("_id", {"_id": {"$nin": list(counts)}})
+        else:
+            stale = [] if project_id in counts else [project_id]
+        now = datetime.utcnow()
+        operations = [
+            ReplaceOne(
+                {"_id": id}, {"counts": project_counts, "updated_at": now}, upsert=True
+            )
+            for id, project_counts in counts.items()
+        ]
+        operations += [
+            ReplaceOne({"_id": id}, {"counts": {}, "updated_at": now}) for id in stale
+        ]
+        if operations:
+            await cls.get_motor_collection().bulk_write(operations, ordered=False)
+
+    def matrix(self) -> dict[str, dict[str, int]]:
+        return {
+            status: {
+                severity: self.counts.get(status, {}).get(severity, 0)
+                for severity in SEVERITIES
+            }
+            for status in STATUSES
+        }
@@ -1,11 +1,36 @@
 from datetime import datetime
+from typing import Optional
 
-from beanie import Document, Indexed, PydanticObjectId
+from beanie import (
+    Document,
+    Indexed,
+    PydanticObjectId,
+    Replace,
+    SaveChanges,
+    Update,
+    after_event,
+)
 from pydantic import Field
 
+from config.settings import settings
+
+from .bug_details import BugDetail
+
 
 class Project(Document):
     name: Indexed(str)
     description: str
     created_by: PydanticObjectId
     created_at: datetime = Field(default_factory=datetime.utcnow)
+    deleted_at: Optional[datetime] = None
+
+    @classmethod
+    async def get_active(cls, project_id: PydanticObjectId) -> Optional["Project"]:
+        return await cls.find_one(cls.id == project_id, cls.deleted_at == None)
+
+    @after_event(Update, Replace, SaveChanges)
+    async def sync_bug_details(self) -> None:
+        if settings.BUG_DETAIL_READ_MODEL:
+            await BugDetail.sync_project(
+                project_id=self.id, name=self.name, description=self.description
+            )
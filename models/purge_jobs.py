@@ -0,0 +1,85 @@
+from datetime import datetime, timedelta
+from typing import Literal, Optional
+
+from beanie import Document, PydanticObjectId
+from beanie.odm.utils.parsing import parse_obj
+from pydantic import Field
+from pymongo import ASCENDING, IndexModel, ReturnDocument
+
+
+class PurgeJob(Document):
+    id: PydanticObjectId
+    requested_by: PydanticObjectId
+    state: Literal["pending", "running", "done"] = "pending"
+    total: int = 0
+    purged: int = 0
+    lease_owner: Optional[str] = None
+    lease_expires_at: Optional[datetime] = None
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+    finished_at: Optional[datetime] = None
+
+    class Settings:
+        indexes = [
+            IndexModel(
+                [("state", ASCENDING), ("created_at", ASCENDING)], name="state_created"
+            ),
+            IndexModel(
+                [("finished_at", ASCENDING)],
+                name="finished_ttl",
+                expireAfterSeconds=7 * 24 * 3600,
+            ),
+        ]
+
+    @classmethod
+    async def pending_ids(cls) -> list[PydanticObjectId]:
+        return await cls.distinct("_id", {"state": {"$ne": "done"}})
+
+    @classmethod
+    async def claim(cls, owner: str, lease_seconds: float) -> Optional["PurgeJob"]:
+        now = datetime.utcnow()
+        document = await cls.get_motor_collection().find_one_and_update(
+            {
+                "state": {"$ne": "done"},
+                "$or": [
+                    {"lease_expires_at": None},
+                    {"lease_expires_at": {"$lt": now}},
+                ],
+            },
+            {
+                "$set": {
+                    "state": "running",
+                    "lease_owner": owner,
+                    "lease_expires_at": now + timedelta(seconds=lease_seconds),
+                }
+            },
+            sort=[("created_at", ASCENDING)],
+            return_document=ReturnDocument.AFTER,
+        )
+        return None if document is None else parse_obj(cls, document)
+
+    async def record_batch(self, purged: int, lease_seconds: float) -> bool:
+        result = await self.get_motor_collection().update_one(
+            {"_id": self.id, "lease_owner": self.lease_owner},
+            {
+                "$inc": {"purged": purged},
+                "$set": {
+                    "lease_expires_at": datetime.utcnow()
+                    + timedelta(seconds=lease_seconds)
+                },
+            },
+        )
+        self.purged += purged
+        return result.matched_count == 1
+
+    async def finish(self) -> None:
+        await self.get_motor_collection().update_one(
+            {"_id": self.id, "lease_owner": self.lease_owner},
+            {
+                "$set": {
+                    "state": "done",
+                    "lease_owner": None,
+                    "lease_expires_at": None,
+                    "finished_at": datetime.utcnow(),
+                }
+            },
+        )
@@ -0,0 +1,19 @@
+from datetime import datetime
+
+from beanie import Document
+from pydantic import Field
+from pymongo import ASCENDING, IndexModel
+
+
+class RevokedToken(Document):
+    id: str
+    expires_at: datetime
+    revoked_at: datetime = Field(default_factory=datetime.utcnow)
+
+    class Settings:
+        indexes = [
+            IndexModel(
+                [("expires_at", ASCENDING)], name="expires_ttl", expireAfterSeconds=0
+            ),
+            IndexModel([("revoked_at", ASCENDING)], name="revoked_at"),
+        ]
@@ -1,10 +1,25 @@
 from datetime import datetime
-from typing import Literal, Optional
+from typing import Iterable, Literal, Optional
 
-from beanie import Document, Indexed
+from beanie import (
+    Delete,
+    Document,
+    Indexed,
+    PydanticObjectId,
+    Replace,
+    Save,
+    SaveChanges,
+    Update,
+    after_event,
+)
 from pydantic import Field
 
-from utils.password import verify_hash_password
+from config.settings import settings
+from utils.cache import response_cache
+from utils.password import verify_hash_password_async
+from utils.principal_cache import principal_cache, user_id_cache
+
+from .bug_details import BugDetail
 
 
 class User(Document):
@@ -22,13 +37,36 @@ class User(Document):
     @classmethod
     async def authenticate(cls, *, email: str, password: str) -> Optional["User"]:
         user = await cls.get_user_by_email(email=email)
-        if not user or not verify_hash_password(user.hashed_password, password):
+        if not user or not await verify_hash_password_async(
+            user.hashed_password, password
+        ):
             return None
         return user
 
     @classmethod
-    async def has_role(cls, *, email: str, role: str) -> bool:
-        user = await cls.get_user_by_email(email=email)
-        if not user:
-            return False
-        return user.role == role
+    async def missing_ids(
+        cls, ids: Iterable[PydanticObjectId]
+    ) -> list[PydanticObjectId]:
+        ids = list(dict.fromkeys(ids))
+        unknown = [id for id in ids if user_id_cache.get(id) is None]
+        if unknown:
+            for id in await cls.distinct("_id", {"_id": {"$in": unknown}}):
+                user_id_cache.set(id, True)
+        return [id for id in unknown if user_id_cache.get(id) is None]
+
+    @after_event(Update, Replace, Save, SaveChanges, Delete)
+    async def invalidate_cached_views(self) -> None:
+        principal_cache.invalidate(self.email)
+        principal_cache.invalidate_where(lambda user: user.id == self.id)
+        await response_cache.invalidate(f"user:{self.id}")
+
+    @after_event(Update, Replace, SaveChanges)
+    async def sync_bug_details(self) -> None:
+        if settings.BUG_DETAIL_READ_MODEL:
+            await BugDetail.sync_user(user_id=self.id, email=self.email, role=self.role)
+
+    @after_event(Delete)
+    async def remove_from_bug_details(self) -> None:
+        user_id_cache.invalidate(self.id)
+        if settings.BUG_DETAIL_READ_MODEL:
+            await BugDetail.remove_user(user_id=self.id)
@@ -1,113 +1,564 @@
-from typing import Literal, Optional
+from collections import Counter
+from datetime import datetime, timedelta
+from typing import AsyncIterator, Collection, Literal, Optional
 
 from beanie import PydanticObjectId
-from beanie.operators import In
-from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Response, status
-from fastapi.encoders import jsonable_encoder
-from fastapi.responses import JSONResponse
+from beanie.operators import In, NotIn
+from fastapi import (
+    APIRouter,
+    Body,
+    Depends,
+    HTTPException,
+    Query,
+    Request,
+    Response,
+    status,
+)
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError
 
-from models.bugs import Bug
+from config.settings import settings
+from models.bug_details import BugDetail
+from models.bug_history import BugHistory, HistoryEvent, bucket_of, transitions_pipeline
+from models.bugs import Bug, bug_detail_pipeline, bug_search_pipeline
+from models.project_stats import ProjectStats
 from models.projects import Project
 from models.users import User
 from schemas import bugs as BugSchema
-from schemas import users as UserSchema
-from utils.security import get_current_user
-from utils.telegram_notification import send_message
+from utils.bug_feed import bug_feed
+from utils.cache import response_cache
+from utils.consistency import aggregate, find_all, find_first, iterate, write_session
+from utils.fields import projection_model, sparse_fields
+from utils.history import diff, history_writer
+from utils.notifications import notifier
+from utils.pagination import decode_cursor, encode_cursor, keyset_filter
+from utils.purger import purger
+from utils.search import search_index
+from utils.security import get_current_user, require_role
+from utils.serialization import ORJSONResponse
+from utils.telegram_notification import escape_markdown
 
 router = APIRouter(prefix="/bugs", tags=["Bugs"])
 
 
-def send_message_to_telegram(text: str):
-    send_message(text=text)
+def missing_users_detail(missing: list[PydanticObjectId]) -> str:
+    return "Users not found in the database: " + ", ".join(map(str, missing))
+
+
+async def stream_ndjson(query) -> AsyncIterator[bytes]:
+    async for document in query:
+        yield document.model_dump_json(by_alias=True).encode() + b"\n"
 
 
 @router.post("/")
 async def create_bug(
     bug: BugSchema.BugCreate,
-    background_tasks: BackgroundTasks,
-    user: UserSchema.UserOut = Depends(get_current_user),
+    user: User = Depends(
+        require_role("manager", detail="You are not authorized to create a ticket.")
+    ),
 ):
-    is_manager = await User.has_role(email=user.email, role="manager")
-    if not is_manager:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="You are not authorized to create a ticket.",
-        )
-    project_id = await Project.get(bug.project_id)
+    project_id = await Project.get_active(bug.project_id)
     if not project_id:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Project not found"
         )
 
-    if not await User.find_one(In(User.id, bug.assigned_to)):
+    missing = await User.missing_ids(bug.assigned_to)
+    if missing:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
-            detail="User not found in the database",
+            detail=missing_users_detail(missing),
         )
     b = BugSchema.BugInDBCreate(**bug.model_dump(), created_by=user.id)
-    await Bug(**b.model_dump()).insert()
+    async with write_session(user.id) as session:
+        created = await Bug(**b.model_dump()).insert(session=session)
+        await ProjectStats.apply(
+            Counter({(b.project_id, b.status, b.severity): 1}), session=session
+        )
+    await response_cache.invalidate(f"project-bugs:{b.project_id}")
+    history_writer.record("create", created, user.id, diff(None, created))
 
-    json_encoded = jsonable_encoder(b)
+    format_message = f"*New bug ticket created:*\nTitle: {escape_markdown(b.title)}\nDescription: {escape_markdown(b.description)}\nSeverity: {b.severity}\nStatus: {b.status}\nCreated by: {str(b.created_by)}\nProject ID: {str(b.project_id)}"
+    notifier.notify(format_message)
+    return ORJSONResponse(content=b, status_code=status.HTTP_201_CREATED)
 
-    format_message = f"**New bug ticket created:**\nTitle: {b.title}\nDescription: {b.description}\nSeverity: {b.severity}\nStatus: {b.status}\nCreated by: {str(b.created_by)}\nProject ID: {str(b.project_id)}"
-    background_tasks.add_task(send_message_to_telegram, format_message)
-    return JSONResponse(content=json_encoded, status_code=status.HTTP_201_CREATED)
+
+@router.post("/bulk")
+async def create_bugs_bulk(
+    bugs: list[BugSchema.BugCreate] = Body(..., max_length=settings.BULK_MAX_ITEMS),
+    user: User = Depends(
+        require_role("manager", detail="You are not authorized to create a ticket.")
+    ),
+):
+    project_ids = list({bug.project_id for bug in bugs})
+    missing_users = set(
+        await User.missing_ids(user_id for bug in bugs for user_id in bug.assigned_to)
+    )
+    existing_projects = set(
+        await Project.distinct("_id", {"_id": {"$in": project_ids}, "deleted_at": None})
+    )
+
+    errors = []
+    documents = []
+    indexes = []
+    for index, bug in enumerate(bugs):
+        if bug.project_id not in existing_projects:
+            errors.append(
+                BugSchema.BulkItemError(index=index, detail="Project not found")
+            )
+            continue
+        missing = [id for id in bug.assigned_to if id in missing_users]
+        if missing:
+            errors.append(
+                BugSchema.BulkItemError(
+                    index=index, detail=missing_users_detail(missing)
+                )
+            )
+            continue
+        b = BugSchema.BugInDBCreate(**bug.model_dump(), created_by=user.id)
+        documents.append(Bug(id=PydanticObjectId(), **b.model_dump()))
+        indexes.append(index)
+
+    failed = set()
+    if documents:
+        try:
+            async with write_session(user.id) as session:
+                await Bug.insert_many(documents, ordered=False, session=session)
+        except BulkWriteError as e:
+            for error in e.details["writeErrors"]:
+                failed.add(error["index"])
+                errors.append(
+                    BugSchema.BulkItemError(
+                        index=indexes[error["index"]], detail=error["errmsg"]
+                    )
+                )
+    inserted = [doc for i, doc in enumerate(documents) if i not in failed]
+
+    if inserted:
+        inserted_ids = [doc.id for doc in inserted]
+        for doc in inserted:
+            doc.index_for_search()
+            history_writer.record("create", doc, user.id, diff(None, doc))
+        await ProjectStats.apply(
+            Counter((doc.project_id, doc.status, doc.severity) for doc in inserted)
+        )
+        await response_cache.invalidate(
+            *{f"project-bugs:{doc.project_id}" for doc in inserted}
+        )
+        if settings.BUG_DETAIL_READ_MODEL:
+            async with write_session(user.id) as session:
+                await Bug.refresh_details(
+                    {"_id": {"$in": inserted_ids}}, session=session
+                )
+        lines = "\n".join(
+            escape_markdown(f"- {doc.title} ({doc.severity}, {doc.status})")
+            for doc in inserted
+        )
+        format_message = f"*{len(inserted)} bug tickets created:*\n{lines}\nCreated by: {str(user.id)}"
+        notifier.notify(format_message)
+
+    result = BugSchema.BugBulkCreateOut(
+        inserted_ids=[doc.id for doc in inserted],
+        errors=sorted(errors, key=lambda error: error.index),
+    )
+    return ORJSONResponse(content=result, status_code=status.HTTP_201_CREATED)
+
+
+@router.patch("/bulk")
+async def update_bugs_bulk(
+    updates: list[BugSchema.BugBulkUpdate] = Body(
+        ..., max_length=settings.BULK_MAX_ITEMS
+    ),
+    user: User = Depends(get_current_user),
+):
+    bugs = {
+        bug.id: bug
+        for bug in await Bug.find(
+            In(Bug.id, [update.id for update in updates])
+        ).to_list()
+    }
+
+    errors = []
+    operations = []
+    pending = []
+    seen = set()
+    for index, update in enumerate(updates):
+        if update.id in seen:
+            errors.append(
+                BugSchema.BulkItemError(
+                    index=index, detail="Duplicate bug ticket in request."
+                )
+            )
+            continue
+        seen.add(update.id)
+        bug = bugs.get(update.id)
+        if not bug:
+            errors.append(
+                BugSchema.BulkItemError(index=index, detail="Bug ticket not found.")
+            )
+            continue
+        if bug.created_by != user.id and user.id not in bug.assigned_to:
+            errors.append(
+                BugSchema.BulkItemError(
+                    index=index, detail="You are not assigned to this ticket."
+                )
+            )
+            continue
+        changes = update.model_dump(
+            exclude={"id"}, exclude_defaults=True, exclude_unset=True, exclude_none=True
+        )
+        if not changes:
+            errors.append(
+                BugSchema.BulkItemError(index=index, detail="No fields to update.")
+            )
+            continue
+        operations.append(UpdateOne({"_id": bug.id}, {"$set": changes}))
+        pending.append((index, bug.model_copy(update=changes)))
+
+    failed = set()
+    if operations:
+        try:
+            async with write_session(user.id) as session:
+                await Bug.get_motor_collection().bulk_write(
+                    operations, ordered=False, session=session
+                )
+        except BulkWriteError as e:
+            for error in e.details["writeErrors"]:
+                failed.add(error["index"])
+                errors.append(
+                    BugSchema.BulkItemError(
+                        index=pending[error["index"]][0], detail=error["errmsg"]
+                    )
+                )
+    updated = [bug for i, (_, bug) in enumerate(pending) if i not in failed]
+
+    if updated:
+        updated_ids = [bug.id for bug in updated]
+        for bug in updated:
+            bug.index_for_search()
+            history_writer.record("update", bug, user.id, diff(bugs[bug.id], bug))
+        changes = Counter()
+        for bug in updated:
+            old = bugs[bug.id]
+            changes[(old.project_id, old.status, old.severity)] -= 1
+            changes[(bug.project_id, bug.status, bug.severity)] += 1
+        await ProjectStats.apply(changes)
+        await response_cache.invalidate(
+            *(f"bug:{id}" for id in updated_ids),
+            *{f"project-bugs:{bug.project_id}" for bug in updated},
+        )
+        if settings.BUG_DETAIL_READ_MODEL:
+            async with write_session(user.id) as session:
+                await Bug.refresh_details(
+                    {"_id": {"$in": updated_ids}}, session=session
+                )
+        lines = "\n".join(
+            escape_markdown(f"- {bug.title} ({bug.severity}, {bug.status})")
+            for bug in updated
+        )
+        format_message = f"*{len(updated)} bug tickets updated:*\n{lines}\nUpdated by: {str(user.id)}"
+        notifier.notify(format_message)
+
+    result = BugSchema.BugBulkUpdateOut(
+        updated_ids=[bug.id for bug in updated],
+        errors=sorted(errors, key=lambda error: error.index),
+    )
+    return ORJSONResponse(content=result, status_code=status.HTTP_200_OK)
+
+
+async def visible_project_ids(user_id: PydanticObjectId) -> list[PydanticObjectId]:
+    involved = await Bug.distinct(
+        "project_id", {"$or": [{"assigned_to": user_id}, {"created_by": user_id}]}
+    )
+    return await Project.distinct(
+        "_id",
+        {
+            "$or": [{"created_by": user_id}, {"_id": {"$in": involved}}],
+            "deleted_at": None,
+        },
+    )
+
+
+@router.get("/search")
+async def search_bugs(
+    q: str = Query(..., min_length=1, max_length=256),
+    project_id: Optional[PydanticObjectId] = None,
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = None,
+    user: User = Depends(get_current_user),
+):
+    project_ids = await visible_project_ids(user.id)
+    if project_id:
+        if project_id not in project_ids:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND, detail="Project not found."
+            )
+        project_ids = [project_id]
+
+    if settings.SEARCH_BACKEND == "memory":
+        ranked = search_index.search(
+            q,
+            scopes=project_ids,
+            after=decode_cursor(cursor) if cursor else None,
+            limit=limit,
+        )
+        bugs = {
+            bug.id: bug
+            for bug in await find_all(
+                Bug.find(In(Bug.id, [id for _, id in ranked])).project(
+                    BugSchema.BugInDBOut
+                ),
+                user_id=user.id,
+            )
+        }
+        results = [
+            BugSchema.BugSearchOut(**bugs[id].model_dump(by_alias=True), score=score)
+            for score, id in ranked
+            if id in bugs
+        ]
+    else:
+        after = keyset_filter("score", cursor, descending=True) if cursor else {}
+        results = await aggregate(
+            Bug,
+            bug_search_pipeline(q, project_ids, after, limit),
+            BugSchema.BugSearchOut,
+            user_id=user.id,
+        )
+
+    headers = {}
+    if len(results) == limit:
+        headers["X-Next-Cursor"] = encode_cursor(results[-1].score, results[-1].id)
+    return ORJSONResponse(
+        content=results,
+        status_code=status.HTTP_200_OK,
+        headers=headers,
+    )
+
+
+def filter_bugs(
+    result,
+    severity: Optional[str],
+    status: Optional[str],
+    cursor: Optional[str],
+    projection: type[BaseModel] = BugSchema.BugInDBOut,
+    exclude_projects: Collection[PydanticObjectId] = (),
+):
+    if severity:
+        result = result.find(Bug.severity == severity)
+    if status:
+        result = result.find(Bug.status == status)
+    if cursor:
+        result = result.find(keyset_filter("created_at", cursor))
+    if exclude_projects:
+        result = result.find(NotIn(Bug.project_id, list(exclude_projects)))
+    return result.sort(+Bug.created_at, +Bug.id).project(projection)
+
+
+async def bug_page(result, limit: int, user_id: PydanticObjectId):
+    bugs = await find_all(result.limit(limit), user_id=user_id)
+    headers = {}
+    if len(bugs) == limit:
+        headers["X-Next-Cursor"] = encode_cursor(bugs[-1].created_at, bugs[-1].id)
+    return bugs, headers
 
 
 @router.get("/projects/{project_id}")
 async def get_bugs(
     project_id: PydanticObjectId,
+    request: Request,
     severity: Optional[Literal["low", "medium", "high"]] = None,
     status: Optional[str] = None,
-    limit: int = 5,
+    limit: int = Query(5, ge=1, le=1000),
+    cursor: Optional[str] = None,
+    stream: bool = False,
+    fields: type[BaseModel] = Depends(
+        sparse_fields(BugSchema.BugInDBOut, "id", "created_at")
+    ),
     user: User = Depends(get_current_user),
 ):
-    bugs = []
-    result = Bug.find(Bug.project_id == project_id, limit=limit)
-    if severity:
-        result = result.find(Bug.severity == severity)
-    if status:
-        result = result.find(Bug.status == status)
-    bugs = await result.project(BugSchema.BugInDBOut).to_list()
+    if not stream:
+        cache_key = response_cache.key(request, user.id)
+        cached = await response_cache.lookup(request, cache_key)
+        if cached:
+            return cached
+
+    purging = project_id in await purger.pending_ids()
+    result = filter_bugs(
+        Bug.find(Bug.project_id == project_id),
+        severity,
+        status,
+        cursor,
+        fields,
+        exclude_projects=[project_id] if purging else (),
+    )
+
+    if stream:
+        return StreamingResponse(
+            stream_ndjson(iterate(result, user_id=user.id)),
+            media_type="application/x-ndjson",
+        )
+
+    bugs, headers = await bug_page(result, limit, user.id)
+    return await response_cache.store(
+        request,
+        cache_key,
+        bugs,
+        tags=[f"project-bugs:{project_id}"],
+        headers=headers,
+    )
+
 
-    return bugs
+@router.get("/projects/{project_id}/events")
+async def get_bug_events(
+    project_id: PydanticObjectId, user: User = Depends(get_current_user)
+):
+    if not await Project.get_active(project_id):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Project not found."
+        )
+    if not bug_feed.available():
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Live updates are unavailable.",
+        )
+    subscription = bug_feed.subscribe(project_id)
+    return StreamingResponse(
+        bug_feed.stream(subscription),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.get("/projects/{project_id}/transitions")
+async def get_bug_transitions(
+    project_id: PydanticObjectId,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    user: User = Depends(require_role("manager")),
+):
+    end = end or datetime.utcnow()
+    start = start or end - timedelta(days=30)
+    transitions = await aggregate(
+        BugHistory,
+        [
+            *transitions_pipeline(project_id, start, end),
+            {
+                "$project": {
+                    "_id": 0,
+                    "field": "$_id.field",
+                    "from": "$_id.from",
+                    "to": "$_id.to",
+                    "count": 1,
+                }
+            },
+        ],
+        BugSchema.BugTransitionOut,
+        user_id=user.id,
+    )
+    return ORJSONResponse(content=transitions)
+
+
+@router.get("/assigned/me")
+async def get_assigned_bugs(
+    severity: Optional[Literal["low", "medium", "high"]] = None,
+    status: Optional[Literal["open", "closed", "underdevelopment"]] = None,
+    limit: int = Query(20, ge=1, le=1000),
+    cursor: Optional[str] = None,
+    fields: type[BaseModel] = Depends(
+        sparse_fields(BugSchema.BugInDBOut, "id", "created_at")
+    ),
+    user: User = Depends(get_current_user),
+):
+    result = filter_bugs(
+        Bug.find(Bug.assigned_to == user.id),
+        severity,
+        status,
+        cursor,
+        fields,
+        exclude_projects=await purger.pending_ids(),
+    )
+    bugs, headers = await bug_page(result, limit, user.id)
+    return ORJSONResponse(content=bugs, headers=headers)
+
+
+@router.get("/created/me")
+async def get_created_bugs(
+    severity: Optional[Literal["low", "medium", "high"]] = None,
+    status: Optional[Literal["open", "closed", "underdevelopment"]] = None,
+    limit: int = Query(20, ge=1, le=1000),
+    cursor: Optional[str] = None,
+    fields: type[BaseModel] = Depends(
+        sparse_fields(BugSchema.BugInDBOut, "id", "created_at")
+    ),
+    user: User = Depends(get_current_user),
+):
+    result = filter_bugs(
+        Bug.find(Bug.created_by == user.id),
+        severity,
+        status,
+        cursor,
+        fields,
+        exclude_projects=await purger.pending_ids(),
+    )
+    bugs, headers = await bug_page(result, limit, user.id)
+    return ORJSONResponse(content=bugs, headers=headers)
 
 
 @router.put("/{bug_id}")
 async def update_bug(
     bug_id: PydanticObjectId,
     bug: BugSchema.BugUpdate,
-    background_tasks: BackgroundTasks,
     user: User = Depends(get_current_user),
 ):
-    bug_obj = await Bug.get(bug_id)
-
-    if not bug_obj:
+    changes = bug.model_dump(
+        exclude_defaults=True, exclude_unset=True, exclude_none=True
+    )
+    if not changes:
         raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND, detail="Bug ticket not found."
+            status_code=status.HTTP_400_BAD_REQUEST, detail="No fields to update."
         )
-    is_assigned_to = await Bug.is_assigned_to(bug_id=bug_id, user_id=user.id)
-    is_created_by = bug_obj.created_by == user.id
 
-    if not is_created_by and not is_assigned_to:
+    purging = await purger.pending_ids()
+    async with write_session(user.id) as session:
+        before = await Bug.update_as_editor(
+            bug_id,
+            changes,
+            user_id=user.id,
+            exclude_projects=purging,
+            session=session,
+        )
+        if before is not None:
+            b = before.model_copy(update=changes)
+            previous = (before.project_id, before.status, before.severity)
+            current = (b.project_id, b.status, b.severity)
+            if current != previous:
+                await ProjectStats.apply(
+                    Counter({previous: -1, current: 1}), session=session
+                )
+            if settings.BUG_DETAIL_READ_MODEL:
+                await Bug.refresh_details({"_id": bug_id}, session=session)
+    if before is None:
+        existing = await Bug.get(bug_id)
+        if not existing or existing.project_id in purging:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND, detail="Bug ticket not found."
+            )
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="You are not assigned to this ticket.",
         )
 
-    user_exists = await User.find(In(User.id, bug_obj.assigned_to)).first_or_none()
-    if not user_exists:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="One or more users in assigned_to list do not exist.",
-        )
-
-    b = await bug_obj.set(
-        bug.model_dump(exclude_defaults=True, exclude_unset=True, exclude_none=True)
+    b.index_for_search()
+    await response_cache.invalidate(
+        f"bug:{bug_id}",
+        *{f"project-bugs:{before.project_id}", f"project-bugs:{b.project_id}"},
     )
-    format_message = f"**Bug ticket updated:**\nTitle: {b.title}\nDescription: {b.description}\nSeverity: {b.severity}\nStatus: {b.status}\nCreated by: {str(b.created_by)}\nProject ID: {str(b.project_id)}"
-    background_tasks.add_task(send_message_to_telegram, format_message)
-    return JSONResponse(
+    history_writer.record("update", b, user.id, diff(before, b))
+    format_message = f"*Bug ticket updated:*\nTitle: {escape_markdown(b.title)}\nDescription: {escape_markdown(b.description)}\nSeverity: {b.severity}\nStatus: {b.status}\nCreated by: {str(b.created_by)}\nProject ID: {str(b.project_id)}"
+    notifier.notify(format_message)
+    return ORJSONResponse(
         status_code=status.HTTP_200_OK, content="Bug updated successfully"
     )
 
@@ -115,7 +566,7 @@ async def update_bug(
 @router.delete("/{bug_id}")
 async def delete_bug(bug_id: PydanticObjectId, user: User = Depends(get_current_user)):
     bug = await Bug.get(bug_id)
-    if not bug:
+    if not bug or bug.project_id in await purger.pending_ids():
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Bug ticket not found."
         )
@@ -126,43 +577,107 @@ async def delete_bug(bug_id: PydanticObjectId, user: User = Depends(get_current_
             detail="You are not authorzied to perforrm this action",
         )
 
-    await bug.delete()
+    async with write_session(user.id) as session:
+        result = await bug.delete(session=session)
+        deleted = result is not None and result.deleted_count == 1
+        if deleted:
+            await ProjectStats.apply(
+                Counter({(bug.project_id, bug.status, bug.severity): -1}),
+                session=session,
+            )
+    if not deleted:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Bug ticket not found."
+        )
+    await response_cache.invalidate(f"bug:{bug_id}", f"project-bugs:{bug.project_id}")
+    history_writer.record(
+        "delete", bug, user.id, diff(bug, None, ("status", "severity"))
+    )
     return Response(status_code=status.HTTP_204_NO_CONTENT)
 
 
+@router.get("/{bug_id}/history")
+async def get_bug_history(
+    bug_id: PydanticObjectId,
+    limit: int = Query(50, ge=1, le=1000),
+    cursor: Optional[str] = None,
+    user: User = Depends(get_current_user),
+):
+    purging = await purger.pending_ids()
+    if purging and await BugHistory.find_one(
+        BugHistory.bug_id == bug_id, In(BugHistory.project_id, list(purging))
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Bug not found"
+        )
+
+    match = {"bug_id": bug_id}
+    after = []
+    if cursor:
+        at, _ = decode_cursor(cursor)
+        match["bucket_start"] = {"$gte": bucket_of(at)}
+        after = [{"$match": keyset_filter("at", cursor)}]
+    events = await aggregate(
+        BugHistory,
+        [
+            {"$match": match},
+            {"$unwind": "$events"},
+            {"$replaceRoot": {"newRoot": "$events"}},
+            *after,
+            {"$sort": {"at": 1, "_id": 1}},
+            {"$limit": limit},
+        ],
+        HistoryEvent,
+        user_id=user.id,
+    )
+    headers = {}
+    if len(events) == limit:
+        headers["X-Next-Cursor"] = encode_cursor(events[-1].at, events[-1].id)
+    return ORJSONResponse(content=events, headers=headers)
+
+
 @router.get("/{bug_id}")
 async def get_bug(
     bug_id: PydanticObjectId,
+    request: Request,
+    fields: type[BaseModel] = Depends(sparse_fields(BugSchema.BugDetailOut)),
     user: User = Depends(get_current_user),
 ):
-    bug = (
-        await Bug.find(Bug.id == bug_id)
-        .aggregate(
-            [
-                {
-                    "$lookup": {
-                        "from": "User",
-                        "localField": "assigned_to",
-                        "foreignField": "_id",
-                        "as": "assigned_to",
-                    }
-                },
-                {
-                    "$lookup": {
-                        "from": "Project",
-                        "localField": "project_id",
-                        "foreignField": "_id",
-                        "as": "project",
-                    }
-                },
-            ],
-            projection_model=BugSchema.BugDetailOut,
-        )
-        .to_list()
-    )
-
-    if not bug:
+    cache_key = response_cache.key(request, user.id)
+    cached = await response_cache.lookup(request, cache_key)
+    if cached:
+        return cached
+
+    record = projection_model(
+        BugSchema.BugDetailRecord,
+        frozenset(fields.model_fields) | {"project_id", "assigned_to"},
+    )
+    bug = None
+    if settings.BUG_DETAIL_READ_MODEL:
+        bug = await find_first(
+            BugDetail.find(BugDetail.id == bug_id).project(record),
+            user_id=user.id,
+        )
+    if bug is None:
+        result = await aggregate(
+            Bug,
+            [{"$match": {"_id": bug_id}}, *bug_detail_pipeline()],
+            record,
+            user_id=user.id,
+        )
+        bug = result[0] if result else None
+
+    if not bug or bug.project_id in await purger.pending_ids():
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Bug not found"
         )
-    return bug[0]
+    return await response_cache.store(
+        request,
+        cache_key,
+        fields.model_validate(bug.model_dump(include=set(fields.model_fields))),
+        tags=[
+            f"bug:{bug_id}",
+            f"project:{bug.project_id}",
+            *(f"user:{assignee.id}" for assignee in bug.assigned_to),
+        ],
+    )
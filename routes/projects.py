@@ -1,130 +1,262 @@
+from datetime import datetime
+
 from beanie import PydanticObjectId
-from fastapi import APIRouter, Depends, HTTPException, Response, status
-from fastapi.encoders import jsonable_encoder
-from fastapi.responses import JSONResponse
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
 
+from config.settings import settings
+from models.bugs import Bug
+from models.project_stats import SEVERITIES, ProjectStats
 from models.projects import Project
+from models.purge_jobs import PurgeJob
 from models.users import User
 from schemas import projects as ProjectSchema
-from schemas.users import UserOut
-from utils.security import get_current_user
+from utils.cache import response_cache
+from utils.consistency import find_all, find_first, write_session
+from utils.fields import sparse_fields
+from utils.purger import purger
+from utils.security import require_role
+from utils.serialization import ORJSONResponse
+from utils.transfer import ProjectImport, export_project
 
 router = APIRouter(prefix="/projects", tags=["Projects"])
 
+require_manager = require_role("manager")
+
+
+def purge_job_out(job: PurgeJob) -> ProjectSchema.PurgeJobOut:
+    return ProjectSchema.PurgeJobOut(
+        project_id=job.id,
+        state=job.state,
+        total=job.total,
+        purged=job.purged,
+        created_at=job.created_at,
+        finished_at=job.finished_at,
+    )
+
 
 @router.post("/create")
 async def create_project(
-    project: ProjectSchema.ProjectBase, user: UserOut = Depends(get_current_user)
+    project: ProjectSchema.ProjectBase,
+    user: User = Depends(
+        require_role("manager", detail="You are not authorized to create a project")
+    ),
 ):
-    is_manager = await User.has_role(email=user.email, role="manager")
-
-    if not is_manager:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="You are not authorized to create a project",
-        )
     project_obj = ProjectSchema.ProjectCreate(
         **project.model_dump(), created_by=user.id
     )
 
-    project_created = await Project(**project_obj.model_dump()).insert()
-
-    json_encoded = jsonable_encoder(
-        ProjectSchema.ProjectOut(**project_created.model_dump())
-    )
+    async with write_session(user.id) as session:
+        project_created = await Project(**project_obj.model_dump()).insert(
+            session=session
+        )
+    await response_cache.invalidate(f"user-projects:{user.id}")
 
-    return JSONResponse(
-        content=json_encoded,
+    return ORJSONResponse(
+        content=ProjectSchema.ProjectOut(**project_created.model_dump()),
         status_code=status.HTTP_201_CREATED,
     )
 
 
 @router.get("/")
-async def get_projects(user: UserOut = Depends(get_current_user)):
-    is_manager = await User.has_role(email=user.email, role="manager")
+async def get_projects(
+    request: Request,
+    fields: type[BaseModel] = Depends(sparse_fields(ProjectSchema.ProjectOut, "id")),
+    user: User = Depends(require_manager),
+):
+    cache_key = response_cache.key(request, user.id)
+    cached = await response_cache.lookup(request, cache_key)
+    if cached:
+        return cached
 
-    if not is_manager:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="You are not authorized.",
-        )
-    user = await User.get_user_by_email(email=user.email)
-    result = (
-        await Project.find_many(Project.created_by == user.id)
-        .project(ProjectSchema.ProjectOut)
-        .to_list()
+    result = await find_all(
+        Project.find_many(
+            Project.created_by == user.id, Project.deleted_at == None
+        ).project(fields),
+        user_id=user.id,
+    )
+
+    return await response_cache.store(
+        request, cache_key, result, tags=[f"user-projects:{user.id}"]
     )
 
-    return result
+
+@router.post("/import")
+async def import_project(request: Request, user: User = Depends(require_manager)):
+    importer = ProjectImport(
+        user.id,
+        batch_size=settings.TRANSFER_BATCH_SIZE,
+        max_line_bytes=settings.TRANSFER_MAX_LINE_BYTES,
+    )
+    try:
+        project = await importer.run(request.stream())
+    finally:
+        if importer.project is not None:
+            await response_cache.invalidate(
+                f"project:{importer.project.id}",
+                f"project-bugs:{importer.project.id}",
+                f"user-projects:{user.id}",
+            )
+    return ORJSONResponse(
+        content=ProjectSchema.ProjectImportOut(
+            project_id=project.id,
+            imported=importer.imported,
+            skipped=importer.skipped,
+            unknown_assignees=importer.unknown_assignees,
+        ),
+        status_code=status.HTTP_201_CREATED,
+    )
 
 
 @router.put("/{project_id}")
 async def update_project(
     project_id: str,
     project: ProjectSchema.ProjectUpdate,
-    user: User = Depends(get_current_user),
+    user: User = Depends(require_manager),
 ):
-    is_manager = await User.has_role(email=user.email, role="manager")
-    if not is_manager:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="You are not authorized.",
-        )
     project_obj = await Project.find_one(
-        Project.id == PydanticObjectId(project_id), Project.created_by == user.id
+        Project.id == PydanticObjectId(project_id),
+        Project.created_by == user.id,
+        Project.deleted_at == None,
     )
     if not project_obj:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Project not found.",
         )
-    await project_obj.set(project.model_dump(exclude_unset=True, exclude_none=True))
+    async with write_session(user.id) as session:
+        await project_obj.set(
+            project.model_dump(exclude_unset=True, exclude_none=True), session=session
+        )
+    await response_cache.invalidate(
+        f"project:{project_obj.id}", f"user-projects:{user.id}"
+    )
 
-    return JSONResponse(
+    return ORJSONResponse(
         content={"msg": "Project updated successfully."},
         status_code=status.HTTP_201_CREATED,
     )
 
 
 @router.delete("/{project_id}")
-async def delete_project(project_id: str, user: User = Depends(get_current_user)):
-    is_manager = await User.has_role(email=user.email, role="manager")
-    if not is_manager:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="You are not authorized.",
-        )
+async def delete_project(project_id: str, user: User = Depends(require_manager)):
     project_obj = await Project.find_one(
-        Project.id == PydanticObjectId(project_id), Project.created_by == user.id
+        Project.id == PydanticObjectId(project_id),
+        Project.created_by == user.id,
+        Project.deleted_at == None,
     )
     if not project_obj:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Project not found.",
         )
-    await project_obj.delete()
-    return Response(status_code=status.HTTP_204_NO_CONTENT)
+    job = PurgeJob(
+        id=project_obj.id,
+        requested_by=user.id,
+        total=await Bug.find(Bug.project_id == project_obj.id).count(),
+    )
+    async with write_session(user.id) as session:
+        await project_obj.set({Project.deleted_at: datetime.utcnow()}, session=session)
+        await job.insert(session=session)
+    await response_cache.invalidate(
+        f"project:{project_obj.id}",
+        f"project-bugs:{project_obj.id}",
+        f"user-projects:{user.id}",
+    )
+    purger.wake()
+    return ORJSONResponse(
+        content=purge_job_out(job),
+        status_code=status.HTTP_202_ACCEPTED,
+    )
+
+
+@router.get("/{project_id}/purge")
+async def get_purge_job(
+    project_id: PydanticObjectId, user: User = Depends(require_manager)
+):
+    job = await PurgeJob.get(project_id)
+    if not job or job.requested_by != user.id:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Purge job not found."
+        )
+    return ORJSONResponse(content=purge_job_out(job))
 
 
 @router.get("/{project_id}")
 async def get_project(
-    project_id: PydanticObjectId, user: User = Depends(get_current_user)
+    project_id: PydanticObjectId,
+    request: Request,
+    fields: type[BaseModel] = Depends(sparse_fields(ProjectSchema.ProjectOut, "id")),
+    user: User = Depends(require_manager),
 ):
-    is_manager = await User.has_role(email=user.email, role="manager")
+    cache_key = response_cache.key(request, user.id)
+    cached = await response_cache.lookup(request, cache_key)
+    if cached:
+        return cached
 
-    if not is_manager:
+    project = await find_first(
+        Project.find(Project.id == project_id, Project.deleted_at == None).project(
+            fields
+        ),
+        user_id=user.id,
+    )
+    if not project:
         raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="You are not authorized.",
+            status_code=status.HTTP_404_NOT_FOUND, detail="Project not found."
         )
+    return await response_cache.store(
+        request, cache_key, project, tags=[f"project:{project_id}"]
+    )
 
-    project = (
-        await Project.find(Project.id == project_id)
-        .project(ProjectSchema.ProjectOut)
-        .first_or_none()
+
+@router.get("/{project_id}/export")
+async def export_project_data(
+    project_id: PydanticObjectId, user: User = Depends(require_manager)
+):
+    project = await Project.find_one(
+        Project.id == project_id,
+        Project.created_by == user.id,
+        Project.deleted_at == None,
     )
     if not project:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Project not found."
         )
-    return project
+    return StreamingResponse(
+        export_project(
+            project, user_id=user.id, chunk_size=settings.TRANSFER_CHUNK_BYTES
+        ),
+        media_type="application/gzip",
+        headers={
+            "Content-Disposition": f'attachment; filename="project-{project_id}.ndjson.gz"'
+        },
+    )
+
+
+@router.get("/{project_id}/stats")
+async def get_project_stats(
+    project_id: PydanticObjectId, user: User = Depends(require_manager)
+):
+    if not await Project.get_active(project_id):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Project not found."
+        )
+    stats = await ProjectStats.get(project_id)
+    if stats is None:
+        stats = ProjectStats(id=project_id, updated_at=None)
+
+    counts = stats.matrix()
+    return ORJSONResponse(
+        content=ProjectSchema.ProjectStatsOut(
+            project_id=project_id,
+            total=sum(sum(row.values()) for row in counts.values()),
+            by_status={name: sum(row.values()) for name, row in counts.items()},
+            by_severity={
+                severity: sum(row[severity] for row in counts.values())
+                for severity in SEVERITIES
+            },
+            counts=counts,
+            updated_at=stats.updated_at,
+        )
+    )
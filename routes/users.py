@@ -1,22 +1,32 @@
 from datetime import timedelta
+from typing import Optional
 
 from beanie.exceptions import RevisionIdWasChanged
 from fastapi import APIRouter, Depends, HTTPException, status
-from fastapi.responses import JSONResponse
+from fastapi.responses import Response
 from fastapi.security import OAuth2PasswordRequestForm
 
 from config.settings import settings
 from models.users import User
 from schemas import users as UserSchema
-from utils.password import hash_password
-from utils.security import create_access_token, get_current_user
+from utils.password import hash_password_async
+from utils.principal_cache import principal_cache
+from utils.security import (
+    create_access_token,
+    create_refresh_token,
+    decode_token,
+    get_current_user,
+    oauth2_scheme,
+    revoke_token,
+)
+from utils.serialization import ORJSONResponse
 
 router = APIRouter(prefix="/users", tags=["User"])
 
 
 @router.post("/signup")
 async def signup(user: UserSchema.UserCreate):
-    user.password = hash_password(user.password)
+    user.password = await hash_password_async(user.password)
     try:
         new_user = await User(
             email=user.email, hashed_password=user.password, role=user.role
@@ -26,10 +36,8 @@ async def signup(user: UserSchema.UserCreate):
             detail={"msg": "user already exists"},
             status_code=status.HTTP_400_BAD_REQUEST,
         )
-    return JSONResponse(
-        content=UserSchema.UserOut(
-            email=new_user.email, role=new_user.role
-        ).model_dump(),
+    return ORJSONResponse(
+        content=UserSchema.UserOut(email=new_user.email, role=new_user.role),
         status_code=status.HTTP_201_CREATED,
     )
 
@@ -51,9 +59,44 @@ async def get_access_token(form_data: OAuth2PasswordRequestForm = Depends()):
         sub=user.email,
         expire_time_delta=timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES),
     )
-    return {"access_token": token, "token_type": "bearer"}
+    return {
+        "access_token": token,
+        "refresh_token": create_refresh_token(sub=user.email),
+        "token_type": "bearer",
+    }
+
+
+@router.post("/refresh-token")
+async def refresh_access_token(body: UserSchema.TokenRefresh):
+    payload = decode_token(body.refresh_token, "refresh")
+    user = principal_cache.get(payload["sub"])
+    if user is None:
+        user = await User.get_user_by_email(email=payload["sub"])
+    if not user or not user.is_active or not await revoke_token(payload):
+        raise HTTPException(
+            detail="invalid refresh token", status_code=status.HTTP_401_UNAUTHORIZED
+        )
+    return {
+        "access_token": create_access_token(sub=user.email),
+        "refresh_token": create_refresh_token(sub=user.email),
+        "token_type": "bearer",
+    }
+
+
+@router.post("/logout")
+async def logout(
+    body: Optional[UserSchema.Logout] = None,
+    token: str = Depends(oauth2_scheme),
+    user: User = Depends(get_current_user),
+):
+    await revoke_token(decode_token(token, "access"))
+    if body and body.refresh_token:
+        payload = decode_token(body.refresh_token, "refresh")
+        if payload["sub"] == user.email:
+            await revoke_token(payload)
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
 
 
 @router.get("/dashboard")
 async def dashboard(user: User = Depends(get_current_user)):
-    return UserSchema.UserOut(**user.model_dump())
+    return ORJSONResponse(content=UserSchema.UserOut(**user.model_dump()))
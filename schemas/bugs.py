@@ -41,6 +41,14 @@ class BugInDBOut(BugInDBBase):
     id: PydanticObjectId = Field(..., alias="_id")
 
 
+class BugDeletedOut(BaseModel):
+    id: PydanticObjectId = Field(..., alias="_id")
+
+
+class BugSearchOut(BugInDBOut):
+    score: float
+
+
 class BugDetailOut(BaseModel):
     title: str
     description: str
@@ -48,3 +56,38 @@ class BugDetailOut(BaseModel):
     status: Literal["open", "closed", "underdevelopment"]
     project: list[ProjectOut]
     assigned_to: list[UserOut]
+
+
+class AssigneeOut(UserOut):
+    id: PydanticObjectId = Field(..., alias="_id")
+
+
+class BugDetailRecord(BugDetailOut):
+    project_id: PydanticObjectId
+    assigned_to: list[AssigneeOut]
+
+
+class BugTransitionOut(BaseModel):
+    field: str
+    from_: Optional[str] = Field(None, alias="from")
+    to: Optional[str] = None
+    count: int
+
+
+class BugBulkUpdate(BugUpdate):
+    id: PydanticObjectId
+
+
+class BulkItemError(BaseModel):
+    index: int
+    detail: str
+
+
+class BugBulkCreateOut(BaseModel):
+    inserted_ids: list[PydanticObjectId]
+    errors: list[BulkItemError]
+
+
+class BugBulkUpdateOut(BaseModel):
+    updated_ids: list[PydanticObjectId]
+    errors: list[BulkItemError]
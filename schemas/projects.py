@@ -1,5 +1,5 @@
 from datetime import datetime
-from typing import Optional
+from typing import Literal, Optional
 
 from beanie import PydanticObjectId
 from pydantic import BaseModel, ConfigDict, Field
@@ -29,3 +29,28 @@ class ProjectOut(ProjectBase):
 class ProjectInDBBase(ProjectBase):
     id: PydanticObjectId
     created_at: datetime
+
+
+class ProjectStatsOut(BaseModel):
+    project_id: PydanticObjectId
+    total: int
+    by_status: dict[str, int]
+    by_severity: dict[str, int]
+    counts: dict[str, dict[str, int]]
+    updated_at: Optional[datetime] = None
+
+
+class PurgeJobOut(BaseModel):
+    project_id: PydanticObjectId
+    state: Literal["pending", "running", "done"]
+    total: int
+    purged: int
+    created_at: datetime
+    finished_at: Optional[datetime] = None
+
+
+class ProjectImportOut(BaseModel):
+    project_id: PydanticObjectId
+    imported: int
+    skipped: int
+    unknown_assignees: int
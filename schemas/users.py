@@ -33,6 +33,14 @@ class UserOut(BaseModel):
     role: str
 
 
+class TokenRefresh(BaseModel):
+    refresh_token: str
+
+
+class Logout(BaseModel):
+    refresh_token: Optional[str] = None
+
+
 class UserInDB(UserBase):
     id: int
     is_active: bool = True
@@ -0,0 +1,95 @@
+import os
+
+for key, value in {
+    "HOST": "127.0.0.1",
+    "PORT": "8000",
+    "MONGODB_URL": "mongodb://localhost:27017",
+    "MONGODB_DB_NAME": "bug_tracker_test",
+    "JWT_SECRET_KEY": "test",
+    "ACCESS_TOKEN_EXPIRE_MINUTES": "30",
+    "TELEGRAM_TOKEN": "000:test",
+    "TELEGRAM_CHAT_ID": "0",
+    "QUERY_PLAN_CHECK": "off",
+    "RATE_LIMIT_BACKEND": "none",
+}.items():
+    os.environ.setdefault(key, value)
+
+import httpx
+import pytest
+from beanie import init_beanie
+from mongomock_motor import AsyncMongoMockClient
+
+from app import create_app
+from config.settings import settings
+from models import gather_models
+from models.users import User
+from utils.cache import InMemoryCacheBackend, response_cache
+from utils.principal_cache import principal_cache, user_id_cache
+from utils.purger import purger
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+@pytest.fixture
+async def client():
+    await init_beanie(
+        database=AsyncMongoMockClient()[settings.MONGODB_DB_NAME],
+        document_models=gather_models(),
+    )
+    principal_cache.clear()
+    user_id_cache.clear()
+    purger.wake()
+    response_cache.backend = InMemoryCacheBackend(
+        max_entries=settings.RESPONSE_CACHE_MAX_ENTRIES,
+        ttl=settings.RESPONSE_CACHE_TTL_SECONDS,
+    )
+    async with httpx.AsyncClient(app=create_app(), base_url="http://test") as client:
+        yield client
+
+
+@pytest.fixture
+def login(client):
+    async def login(email: str, role: str = "manager") -> dict[str, str]:
+        await client.post(
+            "/users/signup",
+            json={"email": email, "password": "password123", "role": role},
+        )
+        response = await client.post(
+            "/users/access-token",
+            data={"username": email, "password": "password123"},
+        )
+        return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+    return login
+
+
+@pytest.fixture
+def user_queries(monkeypatch):
+    calls = []
+    find_one = User.find_one
+
+    def counting_find_one(*args, **kwargs):
+        calls.append(args)
+        return find_one(*args, **kwargs)
+
+    monkeypatch.setattr(User, "find_one", counting_find_one)
+    return calls
+
+
+@pytest.fixture
+def collection_access(monkeypatch):
+    calls = []
+    for model in gather_models():
+        get_collection = model.get_motor_collection
+
+        def counting_get_collection(get_collection=get_collection, model=model):
+            calls.append(model.__name__)
+            return get_collection()
+
+        monkeypatch.setattr(
+            model, "get_motor_collection", staticmethod(counting_get_collection)
+        )
+    return calls
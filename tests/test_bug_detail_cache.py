@@ -0,0 +1,72 @@
+import pytest
+
+from models.users import User
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+async def bug(client, login):
+    await login("developer@example.com", "developer")
+    headers = await login("manager@example.com")
+    developer = await User.get_user_by_email(email="developer@example.com")
+    project = await client.post(
+        "/projects/create",
+        json={"name": "project", "description": "description"},
+        headers=headers,
+    )
+    project_id = project.json()["_id"]
+    created = await client.post(
+        "/bugs/bulk",
+        json=[
+            {
+                "title": "title",
+                "description": "description",
+                "severity": "low",
+                "status": "open",
+                "project_id": project_id,
+                "assigned_to": [str(developer.id)],
+            }
+        ],
+        headers=headers,
+    )
+    return headers, project_id, created.json()["inserted_ids"][0]
+
+
+async def test_signup_keeps_cached_details(client, login, bug, collection_access):
+    headers, _, bug_id = bug
+    first = await client.get(f"/bugs/{bug_id}", headers=headers)
+    await login("someone@example.com", "developer")
+    collection_access.clear()
+
+    response = await client.get(
+        f"/bugs/{bug_id}", headers={**headers, "If-None-Match": first.headers["ETag"]}
+    )
+
+    assert response.status_code == 304
+    assert collection_access == []
+
+
+async def test_assignee_change_invalidates_details(client, bug):
+    headers, _, bug_id = bug
+    await client.get(f"/bugs/{bug_id}", headers=headers)
+    developer = await User.get_user_by_email(email="developer@example.com")
+    await developer.set({User.role: "manager"})
+
+    response = await client.get(f"/bugs/{bug_id}", headers=headers)
+
+    assert response.json()["assigned_to"][0]["role"] == "manager"
+
+
+async def test_project_rename_invalidates_sparse_details(client, bug):
+    headers, project_id, bug_id = bug
+    url = f"/bugs/{bug_id}?fields=title,project"
+    first = await client.get(url, headers=headers)
+    assert first.json().keys() == {"title", "project"}
+    await client.put(
+        f"/projects/{project_id}", json={"name": "renamed"}, headers=headers
+    )
+
+    response = await client.get(url, headers=headers)
+
+    assert response.json()["project"][0]["name"] == "renamed"
@@ -0,0 +1,46 @@
+import asyncio
+
+import pytest
+from beanie import PydanticObjectId
+from pymongo.errors import OperationFailure
+
+from utils.bug_feed import BugFeed
+
+pytestmark = pytest.mark.anyio
+
+
+async def read(feed, subscription):
+    return [chunk async for chunk in feed.stream(subscription)]
+
+
+async def test_overflowing_subscriber_is_disconnected():
+    feed = BugFeed(max_queue=2)
+    feed._task = asyncio.Future()
+    project_id = PydanticObjectId()
+    subscription = feed.subscribe(project_id)
+
+    for _ in range(3):
+        feed.publish(project_id, b"event: update\ndata: {}\n\n")
+
+    chunks = await asyncio.wait_for(read(feed, subscription), 1)
+    assert chunks[-1] == b"event: overflow\ndata: {}\n\n"
+    assert feed.stats()["disconnected"] == 1
+
+
+async def test_standalone_mongod_closes_subscriptions(monkeypatch):
+    feed = BugFeed(retry_backoff=0)
+    attempts = []
+
+    async def watch():
+        attempts.append(1)
+        raise OperationFailure("replica sets only", code=40573)
+
+    monkeypatch.setattr(feed, "_watch", watch)
+    subscription = feed.subscribe(PydanticObjectId())
+
+    chunks = await asyncio.wait_for(read(feed, subscription), 1)
+
+    assert chunks[-1].startswith(b"event: error\n")
+    assert attempts == [1]
+    assert not feed.available()
+    assert feed.stats()["subscribers"] == 0
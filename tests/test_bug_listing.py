@@ -0,0 +1,107 @@
+from datetime import datetime
+
+import pytest
+from beanie import PydanticObjectId
+
+from models.bug_history import HistoryEvent
+from utils.history import history_writer
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_unchanged_poll_is_served_without_mongo(client, login, collection_access):
+    headers = await login("manager@example.com")
+    project = await client.post(
+        "/projects/create",
+        json={"name": "project", "description": "description"},
+        headers=headers,
+    )
+    url = f"/bugs/projects/{project.json()['_id']}"
+    first = await client.get(url, headers=headers)
+    collection_access.clear()
+
+    response = await client.get(
+        url, headers={**headers, "If-None-Match": first.headers["ETag"]}
+    )
+
+    assert response.status_code == 304
+    assert collection_access == []
+
+
+async def test_project_being_purged_lists_no_bugs(client, login):
+    headers = await login("manager@example.com")
+    project = await client.post(
+        "/projects/create",
+        json={"name": "project", "description": "description"},
+        headers=headers,
+    )
+    project_id = project.json()["_id"]
+    await client.post(
+        "/bugs/bulk",
+        json=[
+            {
+                "title": "title",
+                "description": "description",
+                "severity": "low",
+                "status": "open",
+                "project_id": project_id,
+                "assigned_to": [],
+            }
+        ],
+        headers=headers,
+    )
+    assert len((await client.get("/bugs/created/me", headers=headers)).json()) == 1
+
+    await client.delete(f"/projects/{project_id}", headers=headers)
+
+    assert (
+        await client.get(f"/bugs/projects/{project_id}", headers=headers)
+    ).json() == []
+    assert (await client.get("/bugs/created/me", headers=headers)).json() == []
+
+
+async def test_bugs_of_project_being_purged_are_not_found(client, login):
+    headers = await login("manager@example.com")
+    project = await client.post(
+        "/projects/create",
+        json={"name": "project", "description": "description"},
+        headers=headers,
+    )
+    project_id = project.json()["_id"]
+    created = await client.post(
+        "/bugs/bulk",
+        json=[
+            {
+                "title": "title",
+                "description": "description",
+                "severity": "low",
+                "status": "open",
+                "project_id": project_id,
+                "assigned_to": [],
+            }
+        ],
+        headers=headers,
+    )
+    bug_id = created.json()["inserted_ids"][0]
+    await history_writer.write(
+        [
+            (
+                PydanticObjectId(bug_id),
+                PydanticObjectId(project_id),
+                HistoryEvent(at=datetime.utcnow(), op="create", by=PydanticObjectId()),
+            )
+        ]
+    )
+    history = await client.get(f"/bugs/{bug_id}/history", headers=headers)
+    assert len(history.json()) == 1
+    assert (await client.get(f"/bugs/{bug_id}", headers=headers)).status_code == 200
+
+    await client.delete(f"/projects/{project_id}", headers=headers)
+
+    responses = [
+        await client.get(f"/bugs/{bug_id}", headers=headers),
+        await client.get(f"/bugs/{bug_id}/history", headers=headers),
+        await client.put(f"/bugs/{bug_id}", json={"status": "closed"}, headers=headers),
+        await client.delete(f"/bugs/{bug_id}", headers=headers),
+    ]
+    assert [response.status_code for response in responses] == [404] * 4
@@ -0,0 +1,160 @@
+import pytest
+from beanie import PydanticObjectId
+
+from models.bugs import Bug
+from models.users import User
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+async def bug_with_removed_assignee(client, login):
+    await login("developer@example.com", "developer")
+    headers = await login("manager@example.com")
+    developer = await User.get_user_by_email(email="developer@example.com")
+    project = await client.post(
+        "/projects/create",
+        json={"name": "project", "description": "description"},
+        headers=headers,
+    )
+    created = await client.post(
+        "/bugs/bulk",
+        json=[
+            {
+                "title": "title",
+                "description": "description",
+                "severity": "low",
+                "status": "open",
+                "project_id": project.json()["_id"],
+                "assigned_to": [str(developer.id)],
+            }
+        ],
+        headers=headers,
+    )
+    await developer.delete()
+    return headers, created.json()["inserted_ids"][0]
+
+
+async def test_update_ignores_removed_assignees(client, bug_with_removed_assignee):
+    headers, bug_id = bug_with_removed_assignee
+
+    response = await client.put(
+        f"/bugs/{bug_id}", json={"status": "closed"}, headers=headers
+    )
+
+    assert response.status_code == 200
+
+
+async def test_bulk_update_ignores_removed_assignees(client, bug_with_removed_assignee):
+    headers, bug_id = bug_with_removed_assignee
+
+    response = await client.patch(
+        "/bugs/bulk", json=[{"id": bug_id, "status": "closed"}], headers=headers
+    )
+
+    assert response.json() == {"updated_ids": [bug_id], "errors": []}
+
+
+@pytest.fixture
+async def bug(client, login):
+    headers = await login("manager@example.com")
+    project = await client.post(
+        "/projects/create",
+        json={"name": "project", "description": "description"},
+        headers=headers,
+    )
+    project_id = project.json()["_id"]
+    created = await client.post(
+        "/bugs/bulk",
+        json=[
+            {
+                "title": "title",
+                "description": "description",
+                "severity": "low",
+                "status": "open",
+                "project_id": project_id,
+                "assigned_to": [],
+            }
+        ],
+        headers=headers,
+    )
+    return headers, project_id, created.json()["inserted_ids"][0]
+
+
+async def status_counts(client, headers, project_id):
+    response = await client.get(f"/projects/{project_id}/stats", headers=headers)
+    return response.json()["by_status"]
+
+
+async def test_update_moves_the_counter_of_the_previous_state(client, bug):
+    headers, project_id, bug_id = bug
+    await client.patch(
+        "/bugs/bulk", json=[{"id": bug_id, "status": "closed"}], headers=headers
+    )
+
+    response = await client.put(
+        f"/bugs/{bug_id}", json={"status": "underdevelopment"}, headers=headers
+    )
+
+    assert response.status_code == 200
+    assert await status_counts(client, headers, project_id) == {
+        "open": 0,
+        "closed": 0,
+        "underdevelopment": 1,
+    }
+
+
+async def test_update_without_changes_is_rejected(client, bug):
+    headers, project_id, bug_id = bug
+
+    response = await client.put(f"/bugs/{bug_id}", json={}, headers=headers)
+
+    assert response.status_code == 400
+    assert await status_counts(client, headers, project_id) == {
+        "open": 1,
+        "closed": 0,
+        "underdevelopment": 0,
+    }
+
+
+async def test_update_by_outsider_leaves_counters_alone(client, login, bug):
+    headers, project_id, bug_id = bug
+    outsider = await login("outsider@example.com", "developer")
+
+    response = await client.put(
+        f"/bugs/{bug_id}", json={"status": "closed"}, headers=outsider
+    )
+
+    assert response.status_code == 401
+    assert await status_counts(client, headers, project_id) == {
+        "open": 1,
+        "closed": 0,
+        "underdevelopment": 0,
+    }
+
+
+async def test_delete_decrements_counters_once(client, bug, monkeypatch):
+    headers, project_id, bug_id = bug
+    stale = await Bug.get(PydanticObjectId(bug_id))
+
+    response = await client.delete(f"/bugs/{bug_id}", headers=headers)
+
+    assert response.status_code == 204
+    assert await status_counts(client, headers, project_id) == {
+        "open": 0,
+        "closed": 0,
+        "underdevelopment": 0,
+    }
+
+    async def get_stale(*args, **kwargs):
+        return stale
+
+    monkeypatch.setattr(Bug, "get", get_stale)
+    response = await client.delete(f"/bugs/{bug_id}", headers=headers)
+
+    assert response.status_code == 404
+    assert await status_counts(client, headers, project_id) == {
+        "open": 0,
+        "closed": 0,
+        "underdevelopment": 0,
+    }
@@ -0,0 +1,66 @@
+import pytest
+
+from config.settings import settings
+
+pytestmark = pytest.mark.anyio
+
+
+def bug_body(project_id, **overrides):
+    return {
+        "title": "title",
+        "description": "description",
+        "severity": "low",
+        "status": "open",
+        "project_id": project_id,
+        "assigned_to": [],
+        **overrides,
+    }
+
+
+@pytest.fixture
+async def project(client, login):
+    headers = await login("manager@example.com")
+    response = await client.post(
+        "/projects/create",
+        json={"name": "project", "description": "description"},
+        headers=headers,
+    )
+    return headers, response.json()["_id"]
+
+
+async def test_duplicate_ids_in_bulk_update_are_rejected(client, project):
+    headers, project_id = project
+    created = await client.post(
+        "/bugs/bulk", json=[bug_body(project_id)] * 2, headers=headers
+    )
+    first, second = created.json()["inserted_ids"]
+
+    response = await client.patch(
+        "/bugs/bulk",
+        json=[
+            {"id": first, "status": "closed"},
+            {"id": first, "status": "underdevelopment"},
+            {"id": second, "status": "underdevelopment"},
+        ],
+        headers=headers,
+    )
+
+    assert response.json()["updated_ids"] == [first, second]
+    assert [error["index"] for error in response.json()["errors"]] == [1]
+    stats = await client.get(f"/projects/{project_id}/stats", headers=headers)
+    assert stats.json()["by_status"] == {
+        "open": 0,
+        "closed": 1,
+        "underdevelopment": 1,
+    }
+
+
+@pytest.mark.parametrize("method", ["POST", "PATCH"])
+async def test_bulk_bodies_are_bounded(client, project, method):
+    headers, project_id = project
+    items = [bug_body(project_id, id=project_id)] * (settings.BULK_MAX_ITEMS + 1)
+
+    response = await client.request(method, "/bugs/bulk", json=items, headers=headers)
+
+    assert response.status_code == 422
+    assert response.json()["detail"][0]["type"] == "too_long"
@@ -0,0 +1,46 @@
+import pytest
+
+from models.users import User
+from utils.history import history_writer
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_history_of_bug_with_assignees(client, login):
+    await login("developer@example.com", "developer")
+    headers = await login("manager@example.com")
+    developer = await User.get_user_by_email(email="developer@example.com")
+    developer_id = str(developer.id)
+    project = await client.post(
+        "/projects/create",
+        json={"name": "project", "description": "description"},
+        headers=headers,
+    )
+    await history_writer.start()
+    try:
+        created = await client.post(
+            "/bugs/bulk",
+            json=[
+                {
+                    "title": "title",
+                    "description": "description",
+                    "severity": "low",
+                    "status": "open",
+                    "project_id": project.json()["_id"],
+                    "assigned_to": [developer_id],
+                }
+            ],
+            headers=headers,
+        )
+        bug_id = created.json()["inserted_ids"][0]
+        await client.put(f"/bugs/{bug_id}", json={"status": "closed"}, headers=headers)
+    finally:
+        await history_writer.stop()
+
+    response = await client.get(f"/bugs/{bug_id}/history", headers=headers)
+
+    assert response.status_code == 200
+    create, update = response.json()
+    assert create["op"] == "create"
+    assert create["changes"]["assigned_to"] == [None, [developer_id]]
+    assert update["changes"] == {"status": ["open", "closed"]}
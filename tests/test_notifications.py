@@ -0,0 +1,112 @@
+import asyncio
+
+import httpx
+import pytest
+
+from utils.notifications import NotificationDispatcher, notifier
+from utils.telegram_notification import DeliveryError, TelegramBackend, escape_markdown
+
+pytestmark = pytest.mark.anyio
+
+
+class FlakyBackend:
+    def __init__(self) -> None:
+        self.sent = []
+
+    async def start(self) -> None:
+        pass
+
+    async def close(self) -> None:
+        pass
+
+    async def send(self, chat_id: str, text: str) -> None:
+        if text == "boom":
+            raise RuntimeError("unexpected")
+        self.sent.append(text)
+
+
+async def test_rate_limit_with_html_body_is_retryable():
+    transport = httpx.MockTransport(
+        lambda request: httpx.Response(
+            429, text="<html>Too Many Requests</html>", headers={"Retry-After": "3"}
+        )
+    )
+    backend = TelegramBackend(token="token", transport=transport)
+
+    with pytest.raises(DeliveryError) as error:
+        await backend.send("chat", "text")
+
+    assert error.value.retryable
+    assert error.value.retry_after == 3
+    await backend.close()
+
+
+async def test_worker_survives_unexpected_errors():
+    backend = FlakyBackend()
+    dispatcher = NotificationDispatcher(
+        backend, default_chat_id="chat", coalesce_window=0, min_interval=0
+    )
+    await dispatcher.start()
+    dispatcher.notify("boom")
+    await asyncio.wait_for(dispatcher._queue.join(), 1)
+    dispatcher.notify("hello")
+    await asyncio.wait_for(dispatcher._queue.join(), 1)
+    await dispatcher.stop()
+
+    assert backend.sent == ["hello"]
+    assert dispatcher.stats()["failed"] == 1
+
+
+def test_escape_markdown_escapes_reserved_characters():
+    assert escape_markdown("- fix (v1.2)!") == r"\- fix \(v1\.2\)\!"
+
+
+async def test_bulk_summary_is_valid_markdown(client, login, monkeypatch):
+    messages = []
+    monkeypatch.setattr(notifier, "notify", messages.append)
+    headers = await login("manager@example.com")
+    project = await client.post(
+        "/projects/create",
+        json={"name": "project", "description": "description"},
+        headers=headers,
+    )
+
+    await client.post(
+        "/bugs/bulk",
+        json=[
+            {
+                "title": "crash.on-save",
+                "description": "description",
+                "severity": "low",
+                "status": "open",
+                "project_id": project.json()["_id"],
+                "assigned_to": [],
+            }
+        ],
+        headers=headers,
+    )
+
+    assert r"\- crash\.on\-save \(low, open\)" in messages[0]
+
+
+class RejectingBackend(FlakyBackend):
+    async def send(self, chat_id: str, text: str) -> None:
+        if "bad" in text:
+            raise DeliveryError("Bad Request: can't parse entities", retryable=False)
+        self.sent.append(text)
+
+
+async def test_rejected_coalesced_message_is_resent_one_by_one():
+    backend = RejectingBackend()
+    dispatcher = NotificationDispatcher(
+        backend, default_chat_id="chat", coalesce_window=0.05, min_interval=0
+    )
+    await dispatcher.start()
+    for text in ("first", "bad", "second"):
+        dispatcher.notify(text)
+    await asyncio.wait_for(dispatcher._queue.join(), 1)
+    await dispatcher.stop()
+
+    assert backend.sent == ["first", "second"]
+    assert dispatcher.stats()["sent"] == 2
+    assert dispatcher.stats()["failed"] == 1
@@ -0,0 +1,65 @@
+import pytest
+
+from utils.principal_cache import principal_cache
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+async def project(client, login):
+    headers = await login("manager@example.com")
+    response = await client.post(
+        "/projects/create",
+        json={"name": "project", "description": "description"},
+        headers=headers,
+    )
+    return headers, response.json()["_id"]
+
+
+def requests(project_id):
+    return {
+        "create_bug": (
+            "POST",
+            "/bugs/",
+            {
+                "title": "title",
+                "description": "description",
+                "severity": "low",
+                "status": "open",
+                "project_id": project_id,
+                "assigned_to": [],
+            },
+        ),
+        "get_projects": ("GET", "/projects/", None),
+        "update_project": ("PUT", f"/projects/{project_id}", {"name": "renamed"}),
+    }
+
+
+@pytest.mark.parametrize("route", ["create_bug", "get_projects", "update_project"])
+async def test_warm_principal_cache_skips_user_lookup(
+    client, project, user_queries, route
+):
+    headers, project_id = project
+    method, url, body = requests(project_id)[route]
+    await client.get("/projects/", headers=headers)
+    user_queries.clear()
+
+    response = await client.request(method, url, json=body, headers=headers)
+
+    assert response.status_code < 400
+    assert user_queries == []
+
+
+@pytest.mark.parametrize("route", ["create_bug", "get_projects", "update_project"])
+async def test_cold_principal_cache_looks_user_up_once(
+    client, project, user_queries, route
+):
+    headers, project_id = project
+    method, url, body = requests(project_id)[route]
+    principal_cache.clear()
+    user_queries.clear()
+
+    response = await client.request(method, url, json=body, headers=headers)
+
+    assert response.status_code < 400
+    assert len(user_queries) <= 1
@@ -0,0 +1,68 @@
+import pytest
+
+from utils import rate_limit
+from utils.rate_limit import InMemoryRateLimitBackend, Limit, rate_limiter
+
+pytestmark = pytest.mark.anyio
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self):
+        return self.now
+
+    def time(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(rate_limit, "time", clock)
+    return clock
+
+
+async def test_bucket_refills_at_the_limit_rate(clock):
+    backend = InMemoryRateLimitBackend(shards=1)
+    limit = Limit.parse("2/second")
+
+    assert [await backend.acquire("key", limit) for _ in range(3)] == [0, 0, 0.5]
+
+    clock.now += 0.5
+    assert await backend.acquire("key", limit) == 0
+    assert await backend.acquire("key", limit) == pytest.approx(0.5)
+    assert await backend.acquire("other", limit) == 0
+
+
+async def test_least_recently_used_keys_are_evicted(clock):
+    backend = InMemoryRateLimitBackend(shards=1, max_keys=1)
+    limit = Limit.parse("1/minute")
+
+    await backend.acquire("first", limit)
+    await backend.acquire("second", limit)
+
+    assert await backend.acquire("first", limit) == 0
+
+
+async def test_limited_route_answers_with_retry_after(client, clock, monkeypatch):
+    monkeypatch.setattr(rate_limiter, "backend", InMemoryRateLimitBackend(shards=1))
+    monkeypatch.setattr(
+        rate_limiter, "limits", {"POST /users/access-token": Limit.parse("2/minute")}
+    )
+
+    async def login():
+        return await client.post(
+            "/users/access-token",
+            data={"username": "nobody@example.com", "password": "password123"},
+        )
+
+    responses = [await login() for _ in range(3)]
+
+    assert [response.status_code for response in responses] == [401, 401, 429]
+    assert responses[2].headers["Retry-After"] == "30"
+
+    clock.now += 30
+    assert (await login()).status_code == 401
+    assert (await login()).status_code == 429
@@ -0,0 +1,128 @@
+import os
+
+import httpx
+import pytest
+from bson import Timestamp
+
+from app import create_app
+from config.settings import settings
+from utils import consistency
+from utils.consistency import InMemoryWriteMarks, RedisWriteMarks
+from utils.db import close_db, init_db
+
+pytestmark = pytest.mark.anyio
+
+REPLICA_SET_URL = os.environ.get("TEST_REPLICA_SET_URL")
+
+
+class DictRedis:
+    def __init__(self):
+        self.values = {}
+
+    async def get(self, key):
+        return self.values.get(key)
+
+    async def set(self, key, value, px=None):
+        self.values[key] = value
+
+
+MARK = ({"clusterTime": Timestamp(1700000000, 7)}, Timestamp(1700000000, 7))
+
+
+async def test_memory_write_marks_round_trip():
+    marks = InMemoryWriteMarks(max_size=10, ttl=60)
+
+    await marks.set("user", MARK)
+
+    assert await marks.get("user") == MARK
+    assert await marks.get("other") is None
+
+
+async def test_redis_write_marks_are_shared_between_workers():
+    redis = DictRedis()
+    writer = RedisWriteMarks(client=redis, ttl=60)
+    reader = RedisWriteMarks(client=redis, ttl=60)
+
+    await writer.set("user", MARK)
+
+    assert await reader.get("user") == MARK
+    assert await reader.get("other") is None
+
+
+@pytest.fixture
+async def replica_set_client(monkeypatch):
+    monkeypatch.setattr(settings, "MONGODB_URL", REPLICA_SET_URL)
+    monkeypatch.setattr(settings, "MONGODB_DB_NAME", "bug_tracker_ryw_test")
+    monkeypatch.setattr(settings, "MONGODB_READ_PREFERENCE", "secondary")
+    monkeypatch.setattr(settings, "MONGODB_MAX_STALENESS_SECONDS", None)
+    monkeypatch.setattr(
+        consistency,
+        "write_marks",
+        InMemoryWriteMarks(max_size=10, ttl=60),
+    )
+    consistency.read_preference.cache_clear()
+    await init_db()
+    await consistency.get_client().drop_database(settings.MONGODB_DB_NAME)
+    try:
+        async with httpx.AsyncClient(
+            app=create_app(), base_url="http://test"
+        ) as client:
+            yield client
+    finally:
+        await consistency.get_client().drop_database(settings.MONGODB_DB_NAME)
+        await close_db()
+        consistency.read_preference.cache_clear()
+
+
+@pytest.mark.skipif(
+    not REPLICA_SET_URL, reason="set TEST_REPLICA_SET_URL to a replica set"
+)
+async def test_bugs_are_readable_from_secondaries_right_after_writing(
+    replica_set_client,
+):
+    client = replica_set_client
+    await client.post(
+        "/users/signup",
+        json={
+            "email": "manager@example.com",
+            "password": "password123",
+            "role": "manager",
+        },
+    )
+    token = await client.post(
+        "/users/access-token",
+        data={"username": "manager@example.com", "password": "password123"},
+    )
+    headers = {"Authorization": f"Bearer {token.json()['access_token']}"}
+    project = await client.post(
+        "/projects/create",
+        json={"name": "project", "description": "description"},
+        headers=headers,
+    )
+    project_id = project.json()["_id"]
+
+    for _ in range(20):
+        created = await client.post(
+            "/bugs/bulk",
+            json=[
+                {
+                    "title": "title",
+                    "description": "description",
+                    "severity": "low",
+                    "status": "open",
+                    "project_id": project_id,
+                    "assigned_to": [],
+                }
+            ],
+            headers=headers,
+        )
+        (bug_id,) = created.json()["inserted_ids"]
+        updated = await client.put(
+            f"/bugs/{bug_id}", json={"status": "closed"}, headers=headers
+        )
+        assert updated.status_code == 200
+
+        response = await client.get(f"/bugs/{bug_id}", headers=headers)
+
+        assert response.status_code == 200
+        assert response.json()["status"] == "closed"
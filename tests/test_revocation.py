@@ -0,0 +1,79 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from models.revoked_tokens import RevokedToken
+from utils.revocation import BloomFilter, RevocationList
+
+pytestmark = pytest.mark.anyio
+
+
+def later(**delta):
+    return datetime.utcnow() + timedelta(**delta)
+
+
+def test_bloom_filter_has_no_false_negatives():
+    bloom = BloomFilter(1000, 0.01)
+    for i in range(1000):
+        bloom.add(f"member-{i}")
+
+    assert all(f"member-{i}" in bloom for i in range(1000))
+    false_positives = sum(f"stranger-{i}" in bloom for i in range(10_000))
+    assert false_positives < 300
+
+
+async def test_revoked_tokens_are_rejected(client):
+    revocations = RevocationList(capacity=16)
+
+    assert await revocations.revoke("jti", later(minutes=5))
+    assert not await revocations.revoke("jti", later(minutes=5))
+
+    assert revocations.is_revoked("jti")
+    assert not revocations.is_revoked("other")
+
+
+async def test_sync_picks_up_revocations_from_other_workers(client):
+    worker = RevocationList(capacity=16)
+    other_worker = RevocationList(capacity=16)
+    await worker.sync()
+
+    await other_worker.revoke("first", later(minutes=5))
+    await worker.sync()
+    await other_worker.revoke("second", later(minutes=5))
+    await worker.sync()
+
+    assert worker.is_revoked("first")
+    assert worker.is_revoked("second")
+
+
+async def test_expired_revocations_are_pruned(client):
+    revocations = RevocationList(capacity=16)
+    await RevokedToken(id="expired", expires_at=later(minutes=-1)).insert()
+    await revocations.revoke("live", later(minutes=5))
+
+    await revocations.sync()
+
+    assert not revocations.is_revoked("expired")
+    assert revocations.is_revoked("live")
+    assert revocations.stats()["revoked"] == 1
+
+
+async def test_bloom_filter_grows_past_its_capacity(client):
+    revocations = RevocationList(capacity=4)
+    bytes_before = revocations.stats()["bloom_bytes"]
+
+    for i in range(20):
+        await revocations.revoke(f"jti-{i}", later(minutes=5))
+
+    assert all(revocations.is_revoked(f"jti-{i}") for i in range(20))
+    assert revocations.stats()["bloom_bytes"] > bytes_before
+
+
+async def test_logged_out_access_token_is_rejected(client, login):
+    headers = await login("manager@example.com")
+    assert (await client.get("/users/dashboard", headers=headers)).status_code == 200
+
+    response = await client.post("/users/logout", headers=headers)
+
+    assert response.status_code == 204
+    assert (await client.get("/users/dashboard", headers=headers)).status_code == 401
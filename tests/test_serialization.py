@@ -0,0 +1,47 @@
+from datetime import datetime
+
+import orjson
+from beanie import PydanticObjectId
+
+from schemas.bugs import BugInDBOut
+from utils.serialization import dumps
+
+
+def bug(created_at: datetime) -> BugInDBOut:
+    user_id = PydanticObjectId()
+    return BugInDBOut(
+        _id=PydanticObjectId(),
+        title="title",
+        description="description",
+        severity="low",
+        status="open",
+        project_id=PydanticObjectId(),
+        assigned_to=[user_id],
+        created_at=created_at,
+        created_by=user_id,
+    )
+
+
+def test_datetimes_drop_trailing_zeros():
+    body = orjson.loads(
+        dumps(
+            [
+                bug(datetime(2023, 8, 14, 9, 21, 39, 883000)),
+                bug(datetime(2023, 8, 14, 9, 21, 39)),
+            ]
+        )
+    )
+
+    assert [item["created_at"] for item in body] == [
+        "2023-08-14T09:21:39.883",
+        "2023-08-14T09:21:39",
+    ]
+
+
+def test_object_ids_serialize_as_strings():
+    item = bug(datetime(2023, 8, 14))
+
+    body = orjson.loads(dumps({"bug": item, "id": item.id}))
+
+    assert body["id"] == str(item.id)
+    assert body["bug"]["assigned_to"] == [str(item.created_by)]
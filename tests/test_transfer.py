@@ -0,0 +1,136 @@
+import gzip
+
+import orjson
+import pytest
+from beanie import PydanticObjectId
+from fastapi import HTTPException
+
+from config.settings import settings
+from models.bugs import Bug
+from models.project_stats import ProjectStats
+from models.projects import Project
+from models.users import User
+from utils.transfer import decompress, read_lines
+
+pytestmark = pytest.mark.anyio
+
+
+async def chunks(data: bytes, size: int = 7):
+    for start in range(0, len(data), size):
+        yield data[start : start + size]
+
+
+async def collect(data: bytes, max_line_bytes: int):
+    return [line async for line in read_lines(chunks(data), max_line_bytes)]
+
+
+async def exported_project(client, headers, count=5):
+    project = await client.post(
+        "/projects/create",
+        json={"name": "project", "description": "description"},
+        headers=headers,
+    )
+    project_id = project.json()["_id"]
+    await client.post(
+        "/bugs/bulk",
+        json=[
+            {
+                "title": f"title {i}",
+                "description": "description",
+                "severity": "low",
+                "status": "open",
+                "project_id": project_id,
+                "assigned_to": [],
+            }
+            for i in range(count)
+        ],
+        headers=headers,
+    )
+    response = await client.get(f"/projects/{project_id}/export", headers=headers)
+    return project_id, gzip.decompress(response.content)
+
+
+async def test_export_import_round_trip(client, login):
+    headers = await login("manager@example.com")
+    project_id, export = await exported_project(client, headers)
+    await Bug.find_all().delete()
+    await ProjectStats.find_all().delete()
+
+    response = await client.post(
+        "/projects/import", content=chunks(gzip.compress(export)), headers=headers
+    )
+
+    assert response.json()["imported"] == 5
+    stats = await client.get(f"/projects/{project_id}/stats", headers=headers)
+    assert stats.json()["total"] == 5
+
+
+async def test_failed_import_keeps_stats_consistent(client, login, monkeypatch):
+    monkeypatch.setattr(settings, "TRANSFER_BATCH_SIZE", 2)
+    headers = await login("manager@example.com")
+    project_id, export = await exported_project(client, headers)
+    await Bug.find_all().delete()
+    await ProjectStats.find_all().delete()
+    lines = export.splitlines()
+    bad = orjson.loads(lines[-1])
+    bad["data"]["severity"] = "critical"
+    body = b"\n".join(lines[:-1] + [orjson.dumps(bad)])
+
+    response = await client.post("/projects/import", content=body, headers=headers)
+
+    assert response.status_code == 400
+    assert await Bug.count() == 4
+    stats = await client.get(f"/projects/{project_id}/stats", headers=headers)
+    assert stats.json()["total"] == 4
+
+
+async def test_import_is_owned_by_importer_and_drops_unknown_assignees(client, login):
+    headers = await login("manager@example.com")
+    project_id, export = await exported_project(client, headers)
+    await login("developer@example.com", "developer")
+    developer = await User.get_user_by_email(email="developer@example.com")
+    unknown = PydanticObjectId()
+    await Bug.find_all().delete()
+    await ProjectStats.find_all().delete()
+    await Project.find_all().delete()
+    lines = []
+    for line in export.splitlines():
+        record = orjson.loads(line)
+        if record["kind"] == "bug":
+            record["data"]["assigned_to"] = [str(developer.id), str(unknown)]
+        lines.append(orjson.dumps(record))
+    importer = await login("importer@example.com")
+
+    response = await client.post(
+        "/projects/import", content=b"\n".join(lines), headers=importer
+    )
+
+    assert response.json()["imported"] == 5
+    assert response.json()["unknown_assignees"] == 5
+    importer_id = (await User.get_user_by_email(email="importer@example.com")).id
+    bugs = await Bug.find(Bug.project_id == PydanticObjectId(project_id)).to_list()
+    assert {bug.created_by for bug in bugs} == {importer_id}
+    assert all(bug.assigned_to == [developer.id] for bug in bugs)
+
+
+async def test_complete_oversized_line_is_rejected():
+    with pytest.raises(HTTPException) as error:
+        await collect(b"x" * 100 + b"\n{}\n", max_line_bytes=50)
+
+    assert error.value.detail == "Invalid export: line too long"
+
+
+async def test_gzip_bomb_is_rejected_before_inflating():
+    with pytest.raises(HTTPException) as error:
+        await collect(gzip.compress(b"x" * 10_000_000), max_line_bytes=1024)
+
+    assert error.value.detail == "Invalid export: line too long"
+
+
+async def test_gzip_is_decompressed_in_bounded_pieces():
+    data = gzip.compress(b"x" * 1_000_000)
+
+    sizes = [len(piece) async for piece in decompress(chunks(data, 1 << 16), 1024)]
+
+    assert max(sizes) <= 1024
+    assert sum(sizes) == 1_000_000
@@ -0,0 +1,218 @@
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from typing import Any, AsyncIterator, Optional
+
+from beanie import PydanticObjectId
+from pymongo.errors import OperationFailure
+
+from config.settings import settings
+from models.bugs import Bug
+from schemas import bugs as BugSchema
+
+logger = logging.getLogger(__name__)
+
+CHANGE_STREAM_HISTORY_LOST = 286
+CHANGE_STREAM_UNSUPPORTED = (40573, 40324)
+
+
+class Subscription:
+    def __init__(self, project_id: PydanticObjectId, max_queue: int) -> None:
+        self.project_id = project_id
+        self.queue: asyncio.Queue[Optional[bytes]] = asyncio.Queue(
+            maxsize=max_queue + 2
+        )
+
+    def overflow(self) -> None:
+        self.close(b"event: overflow\ndata: {}\n\n")
+
+    def close(self, message: bytes) -> None:
+        while not self.queue.empty():
+            self.queue.get_nowait()
+        self.queue.put_nowait(message)
+        self.queue.put_nowait(None)
+
+
+class BugFeed:
+    def __init__(
+        self,
+        *,
+        max_queue: int = 100,
+        keepalive: float = 15,
+        pre_images: bool = False,
+        retry_backoff: float = 1.0,
+        max_retry_backoff: float = 60.0,
+        unavailable_cooldown: float = 300.0,
+        max_tracked_bugs: int = 100_000,
+    ) -> None:
+        self.max_queue = max_queue
+        self.keepalive = keepalive
+        self.pre_images = pre_images
+        self.retry_backoff = retry_backoff
+        self.max_retry_backoff = max_retry_backoff
+        self.unavailable_cooldown = unavailable_cooldown
+        self.max_tracked_bugs = max_tracked_bugs
+        self.resume_token: Optional[dict] = None
+        self.events = 0
+        self.disconnected = 0
+        self.failures = 0
+        self.unavailable_until = 0.0
+        self._subscribers: dict[PydanticObjectId, set[Subscription]] = {}
+        self._bug_projects: "OrderedDict[Any, PydanticObjectId]" = OrderedDict()
+        self._task: Optional[asyncio.Task] = None
+
+    def available(self) -> bool:
+        return time.monotonic() >= self.unavailable_until
+
+    def subscribe(self, project_id: PydanticObjectId) -> Subscription:
+        subscription = Subscription(project_id, self.max_queue)
+        self._subscribers.setdefault(project_id, set()).add(subscription)
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        subscribers = self._subscribers.get(subscription.project_id)
+        if subscribers is None:
+            return
+        subscribers.discard(subscription)
+        if not subscribers:
+            del self._subscribers[subscription.project_id]
+
+    async def stream(self, subscription: Subscription) -> AsyncIterator[bytes]:
+        try:
+            yield b": connected\n\n"
+            while True:
+                try:
+                    message = await asyncio.wait_for(
+                        subscription.queue.get(), self.keepalive
+                    )
+                except asyncio.TimeoutError:
+                    yield b": keepalive\n\n"
+                    continue
+                if message is None:
+                    return
+                yield message
+        finally:
+            self.unsubscribe(subscription)
+
+    def publish(self, project_id: PydanticObjectId, message: bytes) -> None:
+        self.events += 1
+        for subscription in list(self._subscribers.get(project_id, ())):
+            if subscription.queue.qsize() >= self.max_queue:
+                self.disconnected += 1
+                self.unsubscribe(subscription)
+                subscription.overflow()
+            else:
+                subscription.queue.put_nowait(message)
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    def stats(self) -> dict:
+        return {
+            "subscribers": sum(len(group) for group in self._subscribers.values()),
+            "events": self.events,
+            "disconnected": self.disconnected,
+        }
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self._watch()
+            except OperationFailure as e:
+                if e.code in CHANGE_STREAM_UNSUPPORTED:
+                    self._shutdown(e)
+                    return
+                if e.code == CHANGE_STREAM_HISTORY_LOST:
+                    logger.warning("Bug feed resume token expired, restarting")
+                    self.resume_token = None
+                else:
+                    logger.exception("Bug feed change stream failed")
+            except Exception:
+                logger.exception("Bug feed change stream failed")
+            self.failures += 1
+            await asyncio.sleep(
+                min(
+                    self.max_retry_backoff,
+                    self.retry_backoff * 2 ** (self.failures - 1),
+                )
+            )
+
+    def _shutdown(self, error: OperationFailure) -> None:
+        logger.error("Bug feed disabled, change streams are unavailable: %s", error)
+        self.unavailable_until = time.monotonic() + self.unavailable_cooldown
+        self._task = None
+        message = b'event: error\ndata: {"detail":"Live updates are unavailable."}\n\n'
+        for subscribers in list(self._subscribers.values()):
+            for subscription in list(subscribers):
+                self.unsubscribe(subscription)
+                subscription.close(message)
+
+    async def _watch(self) -> None:
+        options: dict[str, Any] = {"full_document": "updateLookup"}
+        if self.pre_images:
+            options["full_document_before_change"] = "whenAvailable"
+        pipeline = [
+            {
+                "$match": {
+                    "operationType": {"$in": ["insert", "update", "replace", "delete"]}
+                }
+            }
+        ]
+        async with Bug.get_motor_collection().watch(
+            pipeline, resume_after=self.resume_token, **options
+        ) as stream:
+            self.failures = 0
+            async for change in stream:
+                self.resume_token = stream.resume_token
+                self._dispatch(change)
+
+    def _dispatch(self, change: dict) -> None:
+        id = change["documentKey"]["_id"]
+        operation = change["operationType"]
+        if operation == "delete":
+            before = change.get("fullDocumentBeforeChange")
+            project_id = (
+                before["project_id"] if before else self._bug_projects.pop(id, None)
+            )
+            document = None
+        else:
+            document = change.get("fullDocument")
+            if document is None:
+                return
+            project_id = document["project_id"]
+            self._track(id, project_id)
+
+        if project_id not in self._subscribers:
+            return
+        if document is None:
+            event = "delete"
+            data = BugSchema.BugDeletedOut(_id=id).model_dump_json(by_alias=True)
+        else:
+            event = "insert" if operation == "insert" else "update"
+            data = BugSchema.BugInDBOut.model_validate(document).model_dump_json(
+                by_alias=True
+            )
+        self.publish(project_id, f"event: {event}\ndata: {data}\n\n".encode())
+
+    def _track(self, id: Any, project_id: PydanticObjectId) -> None:
+        self._bug_projects[id] = project_id
+        self._bug_projects.move_to_end(id)
+        if len(self._bug_projects) > self.max_tracked_bugs:
+            self._bug_projects.popitem(last=False)
+
+
+bug_feed = BugFeed(
+    max_queue=settings.BUG_FEED_QUEUE_SIZE,
+    keepalive=settings.BUG_FEED_KEEPALIVE_SECONDS,
+    pre_images=settings.BUG_FEED_PRE_IMAGES,
+)
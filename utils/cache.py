@@ -0,0 +1,160 @@
+import hashlib
+import time
+from collections import OrderedDict
+from typing import Any, Iterable, Optional
+from urllib.parse import urlencode
+
+import orjson
+from fastapi import Request, Response, status
+
+from config.settings import settings
+from utils.serialization import dumps
+
+
+class InMemoryCacheBackend:
+    def __init__(self, *, max_entries: int, ttl: float) -> None:
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: "OrderedDict[str, tuple[float, bytes, tuple[str, ...]]]" = (
+            OrderedDict()
+        )
+        self._tags: dict[str, set[str]] = {}
+
+    async def get(self, key: str) -> Optional[bytes]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry[0] < time.monotonic():
+            self._discard(key)
+            return None
+        self._entries.move_to_end(key)
+        return entry[1]
+
+    async def set(self, key: str, value: bytes, tags: Iterable[str]) -> None:
+        self._discard(key)
+        tags = tuple(tags)
+        self._entries[key] = (time.monotonic() + self.ttl, value, tags)
+        for tag in tags:
+            self._tags.setdefault(tag, set()).add(key)
+        while len(self._entries) > self.max_entries:
+            self._discard(next(iter(self._entries)))
+
+    async def invalidate_tags(self, tags: Iterable[str]) -> None:
+        for tag in tags:
+            for key in self._tags.pop(tag, ()):
+                self._discard(key)
+
+    def _discard(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        for tag in entry[2]:
+            keys = self._tags.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tags[tag]
+
+
+class RedisCacheBackend:
+    def __init__(self, *, client: Any, ttl: int, prefix: str = "cache:") -> None:
+        self.client = client
+        self.ttl = ttl
+        self.prefix = prefix
+
+    @classmethod
+    def from_url(cls, url: str, *, ttl: int) -> "RedisCacheBackend":
+        import redis.asyncio as redis
+
+        return cls(client=redis.from_url(url), ttl=ttl)
+
+    async def get(self, key: str) -> Optional[bytes]:
+        return await self.client.get(self.prefix + key)
+
+    async def set(self, key: str, value: bytes, tags: Iterable[str]) -> None:
+        async with self.client.pipeline(transaction=False) as pipe:
+            pipe.set(self.prefix + key, value, ex=self.ttl)
+            for tag in tags:
+                pipe.sadd(f"{self.prefix}tag:{tag}", key)
+                pipe.expire(f"{self.prefix}tag:{tag}", self.ttl)
+            await pipe.execute()
+
+    async def invalidate_tags(self, tags: Iterable[str]) -> None:
+        for tag in tags:
+            tag_key = f"{self.prefix}tag:{tag}"
+            keys = await self.client.smembers(tag_key)
+            await self.client.delete(
+                tag_key, *(self.prefix + key.decode() for key in keys)
+            )
+
+
+def _etag_matches(request: Request, etag: str) -> bool:
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    candidates = {value.strip().removeprefix("W/") for value in header.split(",")}
+    return etag in candidates or "*" in candidates
+
+
+class ResponseCache:
+    def __init__(self, backend: Optional[Any]) -> None:
+        self.backend = backend
+
+    def key(self, request: Request, user_id: Any) -> str:
+        query = urlencode(sorted(request.query_params.multi_items()))
+        return f"{user_id}:{request.url.path}?{query}"
+
+    async def lookup(self, request: Request, key: str) -> Optional[Response]:
+        if self.backend is None:
+            return None
+        entry = await self.backend.get(key)
+        if entry is None:
+            return None
+        meta, body = entry.split(b"\n", 1)
+        headers = orjson.loads(meta)
+        if _etag_matches(request, headers["ETag"]):
+            return Response(
+                status_code=status.HTTP_304_NOT_MODIFIED,
+                headers={"ETag": headers["ETag"]},
+            )
+        return Response(content=body, media_type="application/json", headers=headers)
+
+    async def store(
+        self,
+        request: Request,
+        key: str,
+        content: Any,
+        *,
+        tags: Iterable[str],
+        headers: Optional[dict[str, str]] = None,
+    ) -> Response:
+        body = dumps(content)
+        headers = {**(headers or {}), "ETag": f'"{hashlib.sha1(body).hexdigest()}"'}
+        if self.backend is not None:
+            await self.backend.set(key, orjson.dumps(headers) + b"\n" + body, tags)
+        if _etag_matches(request, headers["ETag"]):
+            return Response(
+                status_code=status.HTTP_304_NOT_MODIFIED,
+                headers={"ETag": headers["ETag"]},
+            )
+        return Response(content=body, media_type="application/json", headers=headers)
+
+    async def invalidate(self, *tags: str) -> None:
+        if self.backend is not None:
+            await self.backend.invalidate_tags(tags)
+
+
+def _create_backend() -> Optional[Any]:
+    if settings.RESPONSE_CACHE_BACKEND == "memory":
+        return InMemoryCacheBackend(
+            max_entries=settings.RESPONSE_CACHE_MAX_ENTRIES,
+            ttl=settings.RESPONSE_CACHE_TTL_SECONDS,
+        )
+    if settings.RESPONSE_CACHE_BACKEND == "redis":
+        return RedisCacheBackend.from_url(
+            settings.REDIS_URL, ttl=settings.RESPONSE_CACHE_TTL_SECONDS
+        )
+    return None
+
+
+response_cache = ResponseCache(_create_backend())
@@ -0,0 +1,171 @@
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from functools import lru_cache
+from typing import Any, AsyncIterator, Optional
+
+import bson
+from beanie import Document
+from beanie.odm.queries.find import FindMany
+from beanie.odm.utils.parsing import parse_obj
+from beanie.odm.utils.projection import get_projection
+from motor.motor_asyncio import AsyncIOMotorClientSession, AsyncIOMotorCollection
+from pymongo import read_preferences
+
+from config.settings import settings
+from utils.db import get_client
+from utils.principal_cache import PrincipalCache
+
+active_session: ContextVar[Optional[AsyncIOMotorClientSession]] = ContextVar(
+    "active_session", default=None
+)
+
+WriteMark = tuple[dict, Any]
+
+
+class InMemoryWriteMarks:
+    def __init__(self, *, max_size: int, ttl: float) -> None:
+        self._marks = PrincipalCache(max_size=max_size, ttl=ttl)
+
+    async def get(self, user_id: Any) -> Optional[WriteMark]:
+        return self._marks.get(user_id)
+
+    async def set(self, user_id: Any, mark: WriteMark) -> None:
+        self._marks.set(user_id, mark)
+
+
+class RedisWriteMarks:
+    def __init__(self, *, client: Any, ttl: float, prefix: str = "ryw:") -> None:
+        self.client = client
+        self.ttl = ttl
+        self.prefix = prefix
+
+    @classmethod
+    def from_url(cls, url: str, *, ttl: float) -> "RedisWriteMarks":
+        import redis.asyncio as redis
+
+        return cls(client=redis.from_url(url), ttl=ttl)
+
+    async def get(self, user_id: Any) -> Optional[WriteMark]:
+        value = await self.client.get(f"{self.prefix}{user_id}")
+        if value is None:
+            return None
+        mark = bson.decode(value)
+        return mark["cluster_time"], mark["operation_time"]
+
+    async def set(self, user_id: Any, mark: WriteMark) -> None:
+        await self.client.set(
+            f"{self.prefix}{user_id}",
+            bson.encode({"cluster_time": mark[0], "operation_time": mark[1]}),
+            px=int(self.ttl * 1000),
+        )
+
+
+def _create_write_marks() -> Any:
+    if settings.READ_YOUR_WRITES_BACKEND == "redis":
+        return RedisWriteMarks.from_url(
+            settings.REDIS_URL, ttl=settings.READ_YOUR_WRITES_WINDOW_SECONDS
+        )
+    return InMemoryWriteMarks(
+        max_size=settings.PRINCIPAL_CACHE_MAX_SIZE,
+        ttl=settings.READ_YOUR_WRITES_WINDOW_SECONDS,
+    )
+
+
+write_marks = _create_write_marks()
+
+
+def routes_to_secondaries() -> bool:
+    return settings.MONGODB_READ_PREFERENCE != "primary"
+
+
+@lru_cache
+def read_preference():
+    mode = read_preferences.read_pref_mode_from_name(settings.MONGODB_READ_PREFERENCE)
+    if mode == read_preferences.ReadPreference.PRIMARY.mode:
+        return read_preferences.ReadPreference.PRIMARY
+    max_staleness = settings.MONGODB_MAX_STALENESS_SECONDS or -1
+    return read_preferences.make_read_preference(mode, None, max_staleness)
+
+
+def read_collection(model: type[Document]) -> AsyncIOMotorCollection:
+    collection = model.get_motor_collection()
+    if not routes_to_secondaries():
+        return collection
+    return collection.with_options(read_preference=read_preference())
+
+
+@asynccontextmanager
+async def write_session(
+    user_id: Any,
+) -> AsyncIterator[Optional[AsyncIOMotorClientSession]]:
+    if not routes_to_secondaries():
+        yield None
+        return
+    async with await get_client().start_session(causal_consistency=True) as session:
+        token = active_session.set(session)
+        try:
+            yield session
+        finally:
+            active_session.reset(token)
+        if session.operation_time is not None:
+            await write_marks.set(
+                user_id, (session.cluster_time, session.operation_time)
+            )
+
+
+@asynccontextmanager
+async def read_session(
+    user_id: Any,
+) -> AsyncIterator[Optional[AsyncIOMotorClientSession]]:
+    if not routes_to_secondaries():
+        yield None
+        return
+    async with await get_client().start_session(causal_consistency=True) as session:
+        mark = await write_marks.get(user_id)
+        if mark is not None:
+            session.advance_cluster_time(mark[0])
+            session.advance_operation_time(mark[1])
+        yield session
+
+
+def _find_cursor(query: FindMany, session: Optional[AsyncIOMotorClientSession]):
+    return read_collection(query.document_model).find(
+        filter=query.get_filter_query(),
+        sort=query.sort_expressions,
+        projection=get_projection(query.projection_model),
+        skip=query.skip_number,
+        limit=query.limit_number,
+        session=session,
+    )
+
+
+async def find_all(query: FindMany, *, user_id: Any) -> list:
+    async with read_session(user_id) as session:
+        return [
+            parse_obj(query.projection_model, document)
+            async for document in _find_cursor(query, session)
+        ]
+
+
+async def find_first(query: FindMany, *, user_id: Any) -> Optional[Any]:
+    result = await find_all(query.limit(1), user_id=user_id)
+    return result[0] if result else None
+
+
+async def iterate(query: FindMany, *, user_id: Any) -> AsyncIterator[Any]:
+    async with read_session(user_id) as session:
+        async for document in _find_cursor(query, session):
+            yield parse_obj(query.projection_model, document)
+
+
+async def aggregate(
+    model: type[Document], pipeline: list[dict], projection_model: Any, *, user_id: Any
+) -> list:
+    pipeline = [*pipeline, {"$project": get_projection(projection_model)}]
+    async with read_session(user_id) as session:
+        return [
+            parse_obj(projection_model, document)
+            async for document in read_collection(model).aggregate(
+                pipeline, session=session
+            )
+        ]
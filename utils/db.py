@@ -1,12 +1,63 @@
+import asyncio
+from typing import Any, Optional
+
 from beanie import init_beanie
 from motor.motor_asyncio import AsyncIOMotorClient
 
 from config.settings import settings
-from models import gather_models
+from utils.instrumentation import command_timer, pool_checkout_timer
+from utils.query_plans import check_query_plans
+
+client: Optional[AsyncIOMotorClient] = None
+
+
+def client_options() -> dict[str, Any]:
+    options: dict[str, Any] = {
+        "maxPoolSize": settings.MONGODB_MAX_POOL_SIZE,
+        "minPoolSize": settings.MONGODB_MIN_POOL_SIZE,
+        "serverSelectionTimeoutMS": settings.MONGODB_SERVER_SELECTION_TIMEOUT_MS,
+        "connectTimeoutMS": settings.MONGODB_CONNECT_TIMEOUT_MS,
+        "event_listeners": [command_timer, pool_checkout_timer],
+    }
+    optional = {
+        "waitQueueTimeoutMS": settings.MONGODB_WAIT_QUEUE_TIMEOUT_MS,
+        "socketTimeoutMS": settings.MONGODB_SOCKET_TIMEOUT_MS,
+        "maxIdleTimeMS": settings.MONGODB_MAX_IDLE_TIME_MS,
+        "compressors": settings.MONGODB_COMPRESSORS,
+    }
+    options.update({key: value for key, value in optional.items() if value})
+    return options
+
+
+def get_client() -> AsyncIOMotorClient:
+    if client is None:
+        raise RuntimeError("init_db() has not been called")
+    return client
 
 
 async def init_db() -> None:
-    client = AsyncIOMotorClient(settings.MONGODB_URL)
+    from models import gather_models
+    from models.bugs import Bug
+
+    global client
+    client = AsyncIOMotorClient(settings.MONGODB_URL, **client_options())
     await init_beanie(
         database=client[settings.MONGODB_DB_NAME], document_models=gather_models()
     )
+    await warm_up(client)
+    if settings.SEARCH_BACKEND == "memory":
+        await Bug.rebuild_search_index()
+    if settings.QUERY_PLAN_CHECK != "off":
+        await check_query_plans(mode=settings.QUERY_PLAN_CHECK)
+
+
+async def warm_up(client: AsyncIOMotorClient) -> None:
+    connections = max(settings.MONGODB_MIN_POOL_SIZE, 1)
+    await asyncio.gather(*(client.admin.command("ping") for _ in range(connections)))
+
+
+async def close_db() -> None:
+    global client
+    if client is not None:
+        client.close()
+        client = None
@@ -0,0 +1,50 @@
+from functools import lru_cache
+from typing import Optional
+
+from fastapi import HTTPException, Query, status
+from pydantic import BaseModel, create_model
+
+
+@lru_cache(maxsize=512)
+def projection_model(model: type[BaseModel], fields: frozenset[str]) -> type[BaseModel]:
+    return create_model(
+        f"{model.__name__}[{','.join(sorted(fields))}]",
+        __config__=model.model_config,
+        **{
+            name: (info.annotation, info)
+            for name, info in model.model_fields.items()
+            if name in fields
+        },
+    )
+
+
+def resolve_fields(model: type[BaseModel], requested: set[str]) -> set[str]:
+    names = {}
+    for name, info in model.model_fields.items():
+        names[name] = name
+        if info.alias:
+            names[info.alias] = name
+    unknown = requested - names.keys()
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown fields: {', '.join(sorted(unknown))}",
+        )
+    return {names[field] for field in requested}
+
+
+def sparse_fields(model: type[BaseModel], *required: str):
+    def field_selection(
+        fields: Optional[str] = Query(
+            None, description="Comma-separated list of fields to return."
+        )
+    ) -> type[BaseModel]:
+        if not fields:
+            return model
+        requested = {field.strip() for field in fields.split(",") if field.strip()}
+        selected = resolve_fields(model, requested) | set(required)
+        if selected == model.model_fields.keys():
+            return model
+        return projection_model(model, frozenset(selected))
+
+    return field_selection
@@ -0,0 +1,152 @@
+import asyncio
+import logging
+from datetime import datetime
+from typing import Any, Iterable, Optional
+
+from beanie import PydanticObjectId
+from pymongo import UpdateOne
+
+from config.settings import settings
+from models.bug_history import BugHistory, HistoryEvent, bucket_of
+
+logger = logging.getLogger(__name__)
+
+TRACKED_FIELDS = ("title", "severity", "status", "assigned_to")
+
+
+def diff(old: Any, new: Any, fields: Iterable[str] = TRACKED_FIELDS) -> dict:
+    changes = {}
+    for field in fields:
+        before = getattr(old, field, None) if old is not None else None
+        after = getattr(new, field, None) if new is not None else None
+        if before != after:
+            changes[field] = (before, after)
+    return changes
+
+
+class HistoryWriter:
+    def __init__(
+        self,
+        *,
+        max_queue: int = 10_000,
+        batch_size: int = 500,
+        flush_interval: float = 0.5,
+        bucket_max_events: int = 200,
+    ) -> None:
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.bucket_max_events = bucket_max_events
+        self.written = 0
+        self.dropped = 0
+        self.failed = 0
+        self._queue: asyncio.Queue[
+            tuple[PydanticObjectId, PydanticObjectId, HistoryEvent]
+        ] = asyncio.Queue(maxsize=max_queue)
+        self._task: Optional[asyncio.Task] = None
+
+    def record(
+        self,
+        op: str,
+        bug: Any,
+        by: PydanticObjectId,
+        changes: Optional[dict] = None,
+    ) -> None:
+        event = HistoryEvent(at=datetime.utcnow(), op=op, by=by, changes=changes or {})
+        try:
+            self._queue.put_nowait((bug.id, bug.project_id, event))
+        except asyncio.QueueFull:
+            self.dropped += 1
+            logger.warning("History queue full, dropping event for bug %s", bug.id)
+
+    async def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self, timeout: float = 5.0) -> None:
+        if self._task is None:
+            return
+        try:
+            await asyncio.wait_for(self._queue.join(), timeout)
+        except asyncio.TimeoutError:
+            logger.warning("Dropping %d unwritten history events", self._queue.qsize())
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    def stats(self) -> dict:
+        return {
+            "queued": self._queue.qsize(),
+            "written": self.written,
+            "dropped": self.dropped,
+            "failed": self.failed,
+        }
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self.flush_interval
+            while len(batch) < self.batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+            try:
+                await self.write(batch)
+                self.written += len(batch)
+            except Exception:
+                self.failed += len(batch)
+                logger.exception("Failed to write %d history events", len(batch))
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+    async def write(
+        self, batch: list[tuple[PydanticObjectId, PydanticObjectId, HistoryEvent]]
+    ) -> None:
+        buckets: dict[tuple, list[HistoryEvent]] = {}
+        for bug_id, project_id, event in batch:
+            buckets.setdefault((bug_id, project_id, bucket_of(event.at)), []).append(
+                event
+            )
+        operations = []
+        for (bug_id, project_id, bucket_start), events in buckets.items():
+            for i in range(0, len(events), self.bucket_max_events):
+                chunk = events[i : i + self.bucket_max_events]
+                operations.append(
+                    UpdateOne(
+                        {
+                            "bug_id": bug_id,
+                            "bucket_start": bucket_start,
+                            "size": {"$lte": self.bucket_max_events - len(chunk)},
+                        },
+                        {
+                            "$push": {
+                                "events": {
+                                    "$each": [
+                                        event.model_dump(by_alias=True)
+                                        for event in chunk
+                                    ]
+                                }
+                            },
+                            "$inc": {"size": len(chunk)},
+                            "$setOnInsert": {"project_id": project_id},
+                        },
+                        upsert=True,
+                    )
+                )
+        await BugHistory.get_motor_collection().bulk_write(operations, ordered=True)
+
+
+history_writer = HistoryWriter(
+    max_queue=settings.HISTORY_QUEUE_SIZE,
+    batch_size=settings.HISTORY_BATCH_SIZE,
+    flush_interval=settings.HISTORY_FLUSH_SECONDS,
+    bucket_max_events=settings.HISTORY_BUCKET_MAX_EVENTS,
+)
@@ -0,0 +1,281 @@
+import bisect
+import logging
+import sys
+import threading
+import time
+from collections import Counter, deque
+from contextvars import ContextVar
+from typing import Callable, Optional
+
+from pymongo import monitoring
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+logger = logging.getLogger(__name__)
+
+
+class RequestStats:
+    __slots__ = ("db_count", "db_time")
+
+    def __init__(self) -> None:
+        self.db_count = 0
+        self.db_time = 0.0
+
+
+request_stats: ContextVar[Optional[RequestStats]] = ContextVar(
+    "request_stats", default=None
+)
+
+
+class CommandTimer(monitoring.CommandListener):
+    def started(self, event: monitoring.CommandStartedEvent) -> None:
+        pass
+
+    def succeeded(self, event: monitoring.CommandSucceededEvent) -> None:
+        self._record(event.duration_micros)
+
+    def failed(self, event: monitoring.CommandFailedEvent) -> None:
+        self._record(event.duration_micros)
+
+    def _record(self, duration_micros: int) -> None:
+        stats = request_stats.get()
+        if stats is not None:
+            stats.db_count += 1
+            stats.db_time += duration_micros / 1_000_000
+
+
+command_timer = CommandTimer()
+
+
+class PoolCheckoutTimer(monitoring.ConnectionPoolListener):
+    def __init__(self) -> None:
+        self._local = threading.local()
+
+    def connection_check_out_started(
+        self, event: monitoring.ConnectionCheckOutStartedEvent
+    ) -> None:
+        self._local.started = time.perf_counter()
+
+    def connection_checked_out(
+        self, event: monitoring.ConnectionCheckedOutEvent
+    ) -> None:
+        self._record(event.address, "ok")
+
+    def connection_check_out_failed(
+        self, event: monitoring.ConnectionCheckOutFailedEvent
+    ) -> None:
+        self._record(event.address, event.reason)
+
+    def _record(self, address: tuple[str, int], outcome: str) -> None:
+        started = getattr(self._local, "started", None)
+        if started is not None:
+            self._local.started = None
+            pool_checkout_wait.observe(
+                (f"{address[0]}:{address[1]}", outcome), time.perf_counter() - started
+            )
+
+    def pool_created(self, event: monitoring.PoolCreatedEvent) -> None:
+        pass
+
+    def pool_ready(self, event: monitoring.PoolReadyEvent) -> None:
+        pass
+
+    def pool_cleared(self, event: monitoring.PoolClearedEvent) -> None:
+        pass
+
+    def pool_closed(self, event: monitoring.PoolClosedEvent) -> None:
+        pass
+
+    def connection_created(self, event: monitoring.ConnectionCreatedEvent) -> None:
+        pass
+
+    def connection_ready(self, event: monitoring.ConnectionReadyEvent) -> None:
+        pass
+
+    def connection_closed(self, event: monitoring.ConnectionClosedEvent) -> None:
+        pass
+
+    def connection_checked_in(self, event: monitoring.ConnectionCheckedInEvent) -> None:
+        pass
+
+
+pool_checkout_timer = PoolCheckoutTimer()
+
+
+def _label_value(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+class Histogram:
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        buckets: tuple[float, ...],
+        labelnames: tuple[str, ...] = ("method", "route"),
+    ) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.buckets = buckets
+        self.labelnames = labelnames
+        self._series: dict[tuple[str, ...], list[float]] = {}
+
+    def observe(self, labels: tuple[str, ...], value: float) -> None:
+        series = self._series.get(labels)
+        if series is None:
+            series = self._series[labels] = [0] * (len(self.buckets) + 3)
+        series[bisect.bisect_left(self.buckets, value)] += 1
+        series[-2] += value
+        series[-1] += 1
+
+    def render(self) -> list[str]:
+        lines = [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} histogram",
+        ]
+        for labels, series in sorted(self._series.items()):
+            base = ",".join(
+                f'{name}="{_label_value(value)}"'
+                for name, value in zip(self.labelnames, labels)
+            )
+            cumulative = 0
+            for bound, count in zip((*self.buckets, "+Inf"), series):
+                cumulative += count
+                lines.append(f'{self.name}_bucket{{{base},le="{bound}"}} {cumulative}')
+            lines.append(f"{self.name}_sum{{{base}}} {series[-2]}")
+            lines.append(f"{self.name}_count{{{base}}} {series[-1]}")
+        return lines
+
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+request_duration = Histogram(
+    "http_request_duration_seconds", "Time spent handling requests.", LATENCY_BUCKETS
+)
+request_db_duration = Histogram(
+    "http_request_db_duration_seconds",
+    "Time spent in MongoDB commands per request.",
+    LATENCY_BUCKETS,
+)
+request_db_queries = Histogram(
+    "http_request_db_queries",
+    "MongoDB commands issued per request.",
+    (0, 1, 2, 3, 4, 5, 8, 13, 21),
+)
+pool_checkout_wait = Histogram(
+    "mongodb_pool_checkout_wait_seconds",
+    "Time spent waiting to check a connection out of the MongoDB pool.",
+    (0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0),
+    labelnames=("address", "outcome"),
+)
+histograms = [
+    request_duration,
+    request_db_duration,
+    request_db_queries,
+    pool_checkout_wait,
+]
+
+stats_providers: dict[str, Callable[[], dict]] = {}
+
+
+def register_stats(name: str, provider: Callable[[], dict]) -> None:
+    stats_providers[name] = provider
+
+
+def render_metrics() -> str:
+    lines = []
+    for histogram in histograms:
+        lines.extend(histogram.render())
+    for name, provider in sorted(stats_providers.items()):
+        for key, value in provider().items():
+            if isinstance(value, (int, float)):
+                lines.append(f"bug_tracker_{name}_{key} {value}")
+    return "\n".join(lines) + "\n"
+
+
+class SlowRequestProfiler:
+    def __init__(self, *, threshold: float, interval: float, depth: int = 8) -> None:
+        self.threshold = threshold
+        self.interval = interval
+        self.depth = depth
+        self._samples: deque = deque(maxlen=int(60 / interval))
+        self._thread: Optional[threading.Thread] = None
+        self._target: Optional[int] = None
+
+    def ensure_started(self) -> None:
+        if self._thread is None:
+            self._target = threading.get_ident()
+            self._thread = threading.Thread(
+                target=self._sample, name="slow-request-profiler", daemon=True
+            )
+            self._thread.start()
+
+    def _sample(self) -> None:
+        while True:
+            time.sleep(self.interval)
+            frame = sys._current_frames().get(self._target)
+            stack = []
+            while frame is not None and len(stack) < self.depth:
+                code = frame.f_code
+                stack.append(f"{code.co_filename}:{frame.f_lineno}:{code.co_name}")
+                frame = frame.f_back
+            self._samples.append((time.perf_counter(), tuple(stack)))
+
+    def report(self, route: str, started: float, finished: float) -> None:
+        if finished - started < self.threshold:
+            return
+        stacks = Counter(
+            stack for at, stack in list(self._samples) if started <= at <= finished
+        )
+        lines = [
+            f"  {count} samples at {' <- '.join(stack[:3])}"
+            for stack, count in stacks.most_common(5)
+        ]
+        logger.warning(
+            "Slow request %s took %.0fms\n%s",
+            route,
+            (finished - started) * 1000,
+            "\n".join(lines),
+        )
+
+
+class InstrumentationMiddleware:
+    def __init__(
+        self, app: ASGIApp, profiler: Optional[SlowRequestProfiler] = None
+    ) -> None:
+        self.app = app
+        self.profiler = profiler
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        if self.profiler is not None:
+            self.profiler.ensure_started()
+
+        stats = RequestStats()
+        token = request_stats.set(stats)
+        started = time.perf_counter()
+
+        async def send_with_timing(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                elapsed = time.perf_counter() - started
+                MutableHeaders(scope=message).append(
+                    "Server-Timing",
+                    f"db;dur={stats.db_time * 1000:.1f};count={stats.db_count}, "
+                    f"app;dur={elapsed * 1000:.1f}",
+                )
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            finished = time.perf_counter()
+            request_stats.reset(token)
+            route = scope.get("route")
+            labels = (scope["method"], route.path if route else "unmatched")
+            request_duration.observe(labels, finished - started)
+            request_db_duration.observe(labels, stats.db_time)
+            request_db_queries.observe(labels, stats.db_count)
+            if self.profiler is not None:
+                self.profiler.report(" ".join(labels), started, finished)
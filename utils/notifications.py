@@ -0,0 +1,153 @@
+import asyncio
+import logging
+from typing import Any, Optional
+
+from config.settings import settings
+from utils.telegram_notification import DeliveryError, telegram_backend
+
+logger = logging.getLogger(__name__)
+
+
+class NotificationDispatcher:
+    def __init__(
+        self,
+        backend: Any,
+        *,
+        default_chat_id: str,
+        max_queue: int = 1000,
+        coalesce_window: float = 2.0,
+        min_interval: float = 1.0,
+        max_retries: int = 5,
+        retry_backoff: float = 1.0,
+        max_message_length: int = 4096,
+    ) -> None:
+        self.backend = backend
+        self.default_chat_id = default_chat_id
+        self.coalesce_window = coalesce_window
+        self.min_interval = min_interval
+        self.max_retries = max_retries
+        self.retry_backoff = retry_backoff
+        self.max_message_length = max_message_length
+        self.sent = 0
+        self.failed = 0
+        self.dropped = 0
+        self._queue: asyncio.Queue[tuple[str, str]] = asyncio.Queue(maxsize=max_queue)
+        self._last_sent: dict[str, float] = {}
+        self._task: Optional[asyncio.Task] = None
+
+    def notify(self, text: str, chat_id: Optional[str] = None) -> None:
+        try:
+            self._queue.put_nowait((chat_id or self.default_chat_id, text))
+        except asyncio.QueueFull:
+            self.dropped += 1
+            logger.warning("Notification queue full, dropping message")
+
+    async def start(self) -> None:
+        if self._task is None:
+            await self.backend.start()
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self, timeout: float = 5.0) -> None:
+        if self._task is None:
+            return
+        try:
+            await asyncio.wait_for(self._queue.join(), timeout)
+        except asyncio.TimeoutError:
+            logger.warning("Dropping %d undelivered notifications", self._queue.qsize())
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        await self.backend.close()
+
+    def stats(self) -> dict:
+        return {
+            "queued": self._queue.qsize(),
+            "sent": self.sent,
+            "failed": self.failed,
+            "dropped": self.dropped,
+        }
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            chat_id, text = await self._queue.get()
+            batch = {chat_id: [text]}
+            received = 1
+            deadline = loop.time() + self.coalesce_window
+            while (timeout := deadline - loop.time()) > 0:
+                try:
+                    chat_id, text = await asyncio.wait_for(self._queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+                batch.setdefault(chat_id, []).append(text)
+                received += 1
+            try:
+                for chat_id, texts in batch.items():
+                    for message, parts in self._coalesce(texts):
+                        try:
+                            await self._deliver_coalesced(chat_id, message, parts)
+                        except Exception:
+                            self.failed += 1
+                            logger.exception("Notification to %s failed", chat_id)
+            finally:
+                for _ in range(received):
+                    self._queue.task_done()
+
+    def _coalesce(self, texts: list[str]) -> list[tuple[str, list[str]]]:
+        messages = []
+        parts: list[str] = []
+        size = 0
+        for text in texts:
+            text = text[: self.max_message_length]
+            if parts and size + 2 + len(text) > self.max_message_length:
+                messages.append(("\n\n".join(parts), parts))
+                parts, size = [], 0
+            size += len(text) + (2 if parts else 0)
+            parts.append(text)
+        if parts:
+            messages.append(("\n\n".join(parts), parts))
+        return messages
+
+    async def _deliver_coalesced(
+        self, chat_id: str, message: str, parts: list[str]
+    ) -> None:
+        error = await self._deliver(chat_id, message)
+        if error is None or error.retryable or len(parts) == 1:
+            if error is not None:
+                self.failed += 1
+            return
+        for text in parts:
+            if await self._deliver(chat_id, text) is not None:
+                self.failed += 1
+
+    async def _deliver(self, chat_id: str, text: str) -> Optional[DeliveryError]:
+        loop = asyncio.get_running_loop()
+        for attempt in range(self.max_retries + 1):
+            wait = self._last_sent.get(chat_id, 0) + self.min_interval - loop.time()
+            if wait > 0:
+                await asyncio.sleep(wait)
+            try:
+                await self.backend.send(chat_id, text)
+            except DeliveryError as e:
+                self._last_sent[chat_id] = loop.time()
+                if not e.retryable or attempt == self.max_retries:
+                    logger.warning("Notification to %s failed: %s", chat_id, e)
+                    return e
+                await asyncio.sleep(e.retry_after or self.retry_backoff * 2**attempt)
+            else:
+                self._last_sent[chat_id] = loop.time()
+                self.sent += 1
+                return None
+
+
+notifier = NotificationDispatcher(
+    telegram_backend,
+    default_chat_id=settings.TELEGRAM_CHAT_ID,
+    max_queue=settings.NOTIFICATION_QUEUE_SIZE,
+    coalesce_window=settings.NOTIFICATION_COALESCE_SECONDS,
+    min_interval=settings.NOTIFICATION_MIN_INTERVAL_SECONDS,
+    max_retries=settings.NOTIFICATION_MAX_RETRIES,
+)
@@ -0,0 +1,47 @@
+import base64
+import binascii
+from datetime import datetime
+from typing import Any, Union
+
+import orjson
+from beanie import PydanticObjectId
+from bson.errors import InvalidId
+from fastapi import HTTPException, status
+
+CursorKey = Union[datetime, float, int, str]
+
+
+def encode_cursor(key: CursorKey, id: PydanticObjectId) -> str:
+    if isinstance(key, datetime):
+        payload = {"d": key.isoformat(), "id": str(id)}
+    else:
+        payload = {"k": key, "id": str(id)}
+    return base64.urlsafe_b64encode(orjson.dumps(payload)).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[CursorKey, PydanticObjectId]:
+    try:
+        payload = orjson.loads(
+            base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        )
+        id = PydanticObjectId(payload["id"])
+        if "d" in payload:
+            return datetime.fromisoformat(payload["d"]), id
+        return payload["k"], id
+    except (
+        binascii.Error,
+        orjson.JSONDecodeError,
+        InvalidId,
+        KeyError,
+        TypeError,
+        ValueError,
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor."
+        )
+
+
+def keyset_filter(field: str, cursor: str, descending: bool = False) -> dict[str, Any]:
+    key, id = decode_cursor(cursor)
+    op = "$lt" if descending else "$gt"
+    return {"$or": [{field: {op: key}}, {field: key, "_id": {op: id}}]}
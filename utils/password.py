@@ -1,6 +1,17 @@
+import asyncio
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Optional
+
 from argon2 import PasswordHasher
 
-ph = PasswordHasher()
+from config.settings import settings
+
+ph = PasswordHasher(
+    time_cost=settings.ARGON2_TIME_COST,
+    memory_cost=settings.ARGON2_MEMORY_COST,
+    parallelism=settings.ARGON2_PARALLELISM,
+)
 
 
 def hash_password(password: str) -> str:
@@ -12,3 +23,75 @@ def verify_hash_password(hashed_password: str, password: str) -> bool:
         return ph.verify(hashed_password, password)
     except:
         return False
+
+
+class PasswordHashPool:
+    def __init__(self, *, workers: int, executor: str = "thread") -> None:
+        self.workers = workers
+        self.executor_kind = executor
+        self.queued = 0
+        self.running = 0
+        self.completed = 0
+        self.wait_seconds_total = 0.0
+        self.max_wait_seconds = 0.0
+        self._executor: Optional[Executor] = None
+        self._slots = asyncio.Semaphore(max(workers, 1))
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            if self.executor_kind == "process":
+                self._executor = ProcessPoolExecutor(max_workers=self.workers)
+            else:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.workers, thread_name_prefix="argon2"
+                )
+        return self._executor
+
+    async def run(self, fn: Callable[..., Any], *args: Any) -> Any:
+        if self.workers <= 0:
+            return fn(*args)
+        queued_at = time.perf_counter()
+        self.queued += 1
+        try:
+            await self._slots.acquire()
+        finally:
+            self.queued -= 1
+        waited = time.perf_counter() - queued_at
+        self.wait_seconds_total += waited
+        self.max_wait_seconds = max(self.max_wait_seconds, waited)
+        self.running += 1
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._get_executor(), fn, *args)
+        finally:
+            self.running -= 1
+            self.completed += 1
+            self._slots.release()
+
+    def stats(self) -> dict:
+        return {
+            "workers": self.workers,
+            "queued": self.queued,
+            "running": self.running,
+            "completed": self.completed,
+            "wait_seconds_total": self.wait_seconds_total,
+            "max_wait_seconds": self.max_wait_seconds,
+        }
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+password_pool = PasswordHashPool(
+    workers=settings.PASSWORD_HASH_WORKERS, executor=settings.PASSWORD_HASH_EXECUTOR
+)
+
+
+async def hash_password_async(password: str) -> str:
+    return await password_pool.run(hash_password, password)
+
+
+async def verify_hash_password_async(hashed_password: str, password: str) -> bool:
+    return await password_pool.run(verify_hash_password, hashed_password, password)
@@ -0,0 +1,129 @@
+import asyncio
+import logging
+import os
+import socket
+import time
+import uuid
+from typing import Optional
+
+from beanie import PydanticObjectId
+
+from config.settings import settings
+from models.bug_details import BugDetail
+from models.bug_history import BugHistory
+from models.bugs import Bug
+from models.project_stats import ProjectStats
+from models.projects import Project
+from models.purge_jobs import PurgeJob
+from utils.search import search_index
+
+logger = logging.getLogger(__name__)
+
+
+class ProjectPurger:
+    def __init__(
+        self,
+        *,
+        batch_size: int = 500,
+        batch_pause: float = 0.05,
+        lease_seconds: float = 60,
+        poll_interval: float = 30,
+        pending_cache_seconds: float = 5,
+    ) -> None:
+        self.batch_size = batch_size
+        self.batch_pause = batch_pause
+        self.lease_seconds = lease_seconds
+        self.poll_interval = poll_interval
+        self.pending_cache_seconds = pending_cache_seconds
+        self.owner = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self.purged = 0
+        self.completed = 0
+        self.failed = 0
+        self._wake = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self._pending: Optional[tuple[float, frozenset[PydanticObjectId]]] = None
+
+    def wake(self) -> None:
+        self._pending = None
+        self._wake.set()
+
+    async def pending_ids(self) -> frozenset[PydanticObjectId]:
+        now = time.monotonic()
+        if self._pending is None or self._pending[0] < now:
+            ids = frozenset(await PurgeJob.pending_ids())
+            self._pending = (now + self.pending_cache_seconds, ids)
+        return self._pending[1]
+
+    async def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    def stats(self) -> dict:
+        return {
+            "purged": self.purged,
+            "completed": self.completed,
+            "failed": self.failed,
+        }
+
+    async def _run(self) -> None:
+        while True:
+            self._wake.clear()
+            try:
+                job = await PurgeJob.claim(self.owner, self.lease_seconds)
+                if job is not None:
+                    await self.purge(job)
+                    continue
+            except Exception:
+                self.failed += 1
+                logger.exception("Project purge failed")
+            try:
+                await asyncio.wait_for(self._wake.wait(), self.poll_interval)
+            except asyncio.TimeoutError:
+                pass
+
+    async def purge(self, job: PurgeJob) -> None:
+        bugs = Bug.get_motor_collection()
+        while True:
+            ids = [
+                document["_id"]
+                async for document in bugs.find(
+                    {"project_id": job.id}, {"_id": 1}
+                ).limit(self.batch_size)
+            ]
+            if not ids:
+                break
+            await bugs.delete_many({"_id": {"$in": ids}})
+            await BugDetail.get_motor_collection().delete_many({"_id": {"$in": ids}})
+            for id in ids:
+                search_index.remove(id)
+            self.purged += len(ids)
+            if not await job.record_batch(len(ids), self.lease_seconds):
+                logger.warning("Lost the lease on purge job %s", job.id)
+                return
+            await asyncio.sleep(self.batch_pause)
+
+        await ProjectStats.find(ProjectStats.id == job.id).delete()
+        await BugHistory.find(BugHistory.project_id == job.id).delete()
+        await Project.find(Project.id == job.id).delete()
+        await job.finish()
+        self._pending = None
+        self.completed += 1
+
+
+purger = ProjectPurger(
+    batch_size=settings.PURGE_BATCH_SIZE,
+    batch_pause=settings.PURGE_BATCH_PAUSE_SECONDS,
+    lease_seconds=settings.PURGE_LEASE_SECONDS,
+    poll_interval=settings.PURGE_POLL_SECONDS,
+    pending_cache_seconds=settings.PURGE_PENDING_CACHE_SECONDS,
+)
@@ -0,0 +1,46 @@
+import logging
+from typing import Any, Iterator, Optional
+
+from beanie import Document
+
+logger = logging.getLogger(__name__)
+
+
+class QueryPlanError(RuntimeError):
+    pass
+
+
+query_shapes: list[tuple[str, type[Document], dict, Optional[list]]] = []
+
+
+def register_query_shape(
+    name: str, model: type[Document], filter: dict, sort: Optional[list] = None
+) -> None:
+    query_shapes.append((name, model, filter, sort))
+
+
+def _plan_stages(plan: dict[str, Any]) -> Iterator[str]:
+    if "stage" in plan:
+        yield plan["stage"]
+    for key in ("queryPlan", "inputStage"):
+        if key in plan:
+            yield from _plan_stages(plan[key])
+    for child in plan.get("inputStages", []):
+        yield from _plan_stages(child)
+
+
+async def check_query_plans(mode: str = "warn") -> list[str]:
+    collection_scans = []
+    for name, model, filter, sort in query_shapes:
+        cursor = model.get_motor_collection().find(filter)
+        if sort:
+            cursor = cursor.sort(sort)
+        explain = await cursor.explain()
+        if "COLLSCAN" in _plan_stages(explain["queryPlanner"]["winningPlan"]):
+            logger.warning("Query shape %r falls back to a COLLSCAN", name)
+            collection_scans.append(name)
+    if collection_scans and mode == "fail":
+        raise QueryPlanError(
+            f"Query shapes without a supporting index: {', '.join(collection_scans)}"
+        )
+    return collection_scans
@@ -0,0 +1,153 @@
+import math
+import time
+import zlib
+from collections import OrderedDict
+from typing import Any, Optional
+
+from fastapi import HTTPException, Request, status
+from jose import JWTError, jwt
+
+from config.settings import settings
+
+PERIODS = {"second": 1, "minute": 60, "hour": 3600, "day": 86400}
+
+TOKEN_BUCKET_SCRIPT = """
+local capacity = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local now = tonumber(ARGV[3])
+local bucket = redis.call("HMGET", KEYS[1], "tokens", "updated")
+local tokens = tonumber(bucket[1]) or capacity
+local updated = tonumber(bucket[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - updated) * rate)
+local retry_after = 0
+if tokens >= 1 then
+    tokens = tokens - 1
+else
+    retry_after = (1 - tokens) / rate
+end
+redis.call("HSET", KEYS[1], "tokens", tokens, "updated", now)
+redis.call("EXPIRE", KEYS[1], math.ceil(capacity / rate) + 1)
+return tostring(retry_after)
+"""
+
+
+class Limit:
+    __slots__ = ("capacity", "rate")
+
+    def __init__(self, capacity: int, period: float) -> None:
+        self.capacity = capacity
+        self.rate = capacity / period
+
+    @classmethod
+    def parse(cls, value: str) -> "Limit":
+        count, _, unit = value.partition("/")
+        if unit not in PERIODS or not count.isdigit() or int(count) < 1:
+            raise ValueError(f"Invalid rate limit {value!r}, expected e.g. '5/minute'")
+        return cls(int(count), PERIODS[unit])
+
+
+class InMemoryRateLimitBackend:
+    def __init__(self, *, shards: int = 16, max_keys: int = 100_000) -> None:
+        self.max_keys_per_shard = max(1, max_keys // shards)
+        self._shards: list["OrderedDict[str, tuple[float, float]]"] = [
+            OrderedDict() for _ in range(shards)
+        ]
+
+    async def acquire(self, key: str, limit: Limit) -> float:
+        shard = self._shards[zlib.crc32(key.encode()) % len(self._shards)]
+        now = time.monotonic()
+        tokens, updated = shard.pop(key, (limit.capacity, now))
+        tokens = min(limit.capacity, tokens + (now - updated) * limit.rate)
+        retry_after = 0.0
+        if tokens >= 1:
+            tokens -= 1
+        else:
+            retry_after = (1 - tokens) / limit.rate
+        shard[key] = (tokens, now)
+        if len(shard) > self.max_keys_per_shard:
+            shard.popitem(last=False)
+        return retry_after
+
+
+class RedisRateLimitBackend:
+    def __init__(self, *, client: Any, prefix: str = "ratelimit:") -> None:
+        self.client = client
+        self.prefix = prefix
+        self._script = client.register_script(TOKEN_BUCKET_SCRIPT)
+
+    @classmethod
+    def from_url(cls, url: str) -> "RedisRateLimitBackend":
+        import redis.asyncio as redis
+
+        return cls(client=redis.from_url(url))
+
+    async def acquire(self, key: str, limit: Limit) -> float:
+        retry_after = await self._script(
+            keys=[self.prefix + key], args=[limit.capacity, limit.rate, time.time()]
+        )
+        return float(retry_after)
+
+
+class RateLimiter:
+    def __init__(
+        self,
+        backend: Optional[Any],
+        limits: dict[str, str],
+        default: Optional[str] = None,
+    ) -> None:
+        self.backend = backend
+        self.limits = {route: Limit.parse(value) for route, value in limits.items()}
+        self.default = Limit.parse(default) if default else None
+        self.allowed = 0
+        self.limited = 0
+
+    async def __call__(self, request: Request) -> None:
+        if self.backend is None:
+            return
+        route = request.scope.get("route")
+        route_key = f"{request.method} {route.path if route else request.url.path}"
+        limit = self.limits.get(route_key, self.default)
+        if limit is None:
+            return
+        retry_after = await self.backend.acquire(
+            f"{route_key}:{self.identity(request)}", limit
+        )
+        if retry_after > 0:
+            self.limited += 1
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail="Too many requests.",
+                headers={"Retry-After": str(math.ceil(retry_after))},
+            )
+        self.allowed += 1
+
+    def identity(self, request: Request) -> str:
+        scheme, _, token = request.headers.get("authorization", "").partition(" ")
+        if scheme.lower() == "bearer" and token:
+            try:
+                payload = jwt.decode(
+                    token=token, key=settings.JWT_SECRET_KEY, algorithms=["HS256"]
+                )
+            except JWTError:
+                payload = {}
+            if payload.get("sub"):
+                return f"user:{payload['sub']}"
+        return f"ip:{request.client.host if request.client else 'unknown'}"
+
+    def stats(self) -> dict:
+        return {"allowed": self.allowed, "limited": self.limited}
+
+
+def _create_backend() -> Optional[Any]:
+    if settings.RATE_LIMIT_BACKEND == "memory":
+        return InMemoryRateLimitBackend(
+            shards=settings.RATE_LIMIT_SHARDS, max_keys=settings.RATE_LIMIT_MAX_KEYS
+        )
+    if settings.RATE_LIMIT_BACKEND == "redis":
+        return RedisRateLimitBackend.from_url(settings.REDIS_URL)
+    return None
+
+
+rate_limiter = RateLimiter(
+    _create_backend(), settings.RATE_LIMITS, default=settings.RATE_LIMIT_DEFAULT
+)
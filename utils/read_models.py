@@ -0,0 +1,22 @@
+import argparse
+import asyncio
+
+from models.bugs import Bug
+from models.project_stats import ProjectStats
+from utils.db import init_db
+
+COMMANDS = {
+    "rebuild-bug-details": Bug.rebuild_details,
+    "reconcile-project-stats": ProjectStats.reconcile,
+}
+
+
+async def run(command: str) -> None:
+    await init_db()
+    await COMMANDS[command]()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Maintain denormalized read models")
+    parser.add_argument("command", choices=sorted(COMMANDS))
+    asyncio.run(run(parser.parse_args().command))
@@ -0,0 +1,146 @@
+import asyncio
+import hashlib
+import logging
+import math
+from datetime import datetime, timedelta
+from typing import Iterator, Optional
+
+from pymongo.errors import DuplicateKeyError
+
+from config.settings import settings
+from models.revoked_tokens import RevokedToken
+
+logger = logging.getLogger(__name__)
+
+
+class BloomFilter:
+    def __init__(self, capacity: int, error_rate: float) -> None:
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.size = max(64, int(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self._bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, key: str) -> Iterator[int]:
+        digest = hashlib.blake2b(key.encode(), digest_size=16).digest()
+        a = int.from_bytes(digest[:8], "little")
+        b = int.from_bytes(digest[8:], "little") | 1
+        return ((a + i * b) % self.size for i in range(self.hashes))
+
+    def add(self, key: str) -> None:
+        for position in self._positions(key):
+            self._bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, key: str) -> bool:
+        return all(
+            self._bits[position >> 3] & (1 << (position & 7))
+            for position in self._positions(key)
+        )
+
+
+class RevocationList:
+    def __init__(
+        self,
+        *,
+        capacity: int = 100_000,
+        error_rate: float = 0.001,
+        sync_interval: float = 5,
+        clock_skew: float = 30,
+    ) -> None:
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.sync_interval = sync_interval
+        self.clock_skew = timedelta(seconds=clock_skew)
+        self.bloom_hits = 0
+        self.checks = 0
+        self._bloom = BloomFilter(capacity, error_rate)
+        self._expiry: dict[str, datetime] = {}
+        self._synced_until: Optional[datetime] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def is_revoked(self, jti: str) -> bool:
+        self.checks += 1
+        if jti not in self._bloom:
+            return False
+        self.bloom_hits += 1
+        return jti in self._expiry
+
+    async def revoke(self, jti: str, expires_at: datetime) -> bool:
+        try:
+            await RevokedToken(id=jti, expires_at=expires_at).insert()
+            revoked = True
+        except DuplicateKeyError:
+            revoked = False
+        self._add(jti, expires_at)
+        return revoked
+
+    async def sync(self) -> None:
+        query = {}
+        if self._synced_until is not None:
+            query = {"revoked_at": {"$gte": self._synced_until - self.clock_skew}}
+        async for token in RevokedToken.find(query):
+            self._add(token.id, token.expires_at)
+            if self._synced_until is None or token.revoked_at > self._synced_until:
+                self._synced_until = token.revoked_at
+        self._prune()
+
+    async def start(self) -> None:
+        if self._task is None:
+            await self.sync()
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    def stats(self) -> dict:
+        return {
+            "revoked": len(self._expiry),
+            "checks": self.checks,
+            "bloom_hits": self.bloom_hits,
+            "bloom_bytes": len(self._bloom._bits),
+        }
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.sync_interval)
+            try:
+                await self.sync()
+            except Exception:
+                logger.exception("Revocation list sync failed")
+
+    def _add(self, jti: str, expires_at: datetime) -> None:
+        if jti in self._expiry:
+            return
+        self._expiry[jti] = expires_at
+        if len(self._expiry) > self._bloom.capacity:
+            self._rebuild(self._bloom.capacity * 2)
+        else:
+            self._bloom.add(jti)
+
+    def _prune(self) -> None:
+        now = datetime.utcnow()
+        expired = [jti for jti, expires_at in self._expiry.items() if expires_at < now]
+        for jti in expired:
+            del self._expiry[jti]
+        if expired:
+            self._rebuild(max(self.capacity, self._bloom.capacity))
+
+    def _rebuild(self, capacity: int) -> None:
+        bloom = BloomFilter(capacity, self.error_rate)
+        for jti in self._expiry:
+            bloom.add(jti)
+        self._bloom = bloom
+
+
+revocation_list = RevocationList(
+    capacity=settings.REVOCATION_BLOOM_CAPACITY,
+    error_rate=settings.REVOCATION_BLOOM_ERROR_RATE,
+    sync_interval=settings.REVOCATION_SYNC_SECONDS,
+)
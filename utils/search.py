@@ -0,0 +1,86 @@
+import heapq
+import math
+import re
+from collections import Counter
+from typing import Hashable, Iterable, Optional
+
+TOKEN_RE = re.compile(r"\w+")
+STOPWORDS = frozenset(
+    "a an and are as at be but by for from has have in is it its of on or that the "
+    "this to was were will with".split()
+)
+
+SEARCH_WEIGHTS = {"title": 3, "description": 1}
+
+
+def tokenize(text: str) -> list[str]:
+    return [
+        token
+        for token in TOKEN_RE.findall(text.lower())
+        if token not in STOPWORDS and len(token) > 1
+    ]
+
+
+class InvertedIndex:
+    def __init__(self, weights: dict[str, float]) -> None:
+        self.weights = weights
+        self._postings: dict[str, dict[Hashable, float]] = {}
+        self._documents: dict[Hashable, tuple[Hashable, frozenset[str]]] = {}
+
+    def __len__(self) -> int:
+        return len(self._documents)
+
+    def add(self, id: Hashable, scope: Hashable, fields: dict[str, str]) -> None:
+        self.remove(id)
+        frequencies: Counter = Counter()
+        for field, text in fields.items():
+            weight = self.weights.get(field, 1.0)
+            for token in tokenize(text):
+                frequencies[token] += weight
+        for token, frequency in frequencies.items():
+            self._postings.setdefault(token, {})[id] = frequency
+        self._documents[id] = (scope, frozenset(frequencies))
+
+    def remove(self, id: Hashable) -> None:
+        entry = self._documents.pop(id, None)
+        if entry is None:
+            return
+        for token in entry[1]:
+            postings = self._postings[token]
+            del postings[id]
+            if not postings:
+                del self._postings[token]
+
+    def clear(self) -> None:
+        self._postings.clear()
+        self._documents.clear()
+
+    def search(
+        self,
+        query: str,
+        *,
+        scopes: Optional[Iterable[Hashable]] = None,
+        after: Optional[tuple[float, Hashable]] = None,
+        limit: int = 20,
+    ) -> list[tuple[float, Hashable]]:
+        allowed = None if scopes is None else set(scopes)
+        scores: Counter = Counter()
+        for token in set(tokenize(query)):
+            postings = self._postings.get(token)
+            if not postings:
+                continue
+            idf = math.log(1 + len(self._documents) / len(postings))
+            for id, frequency in postings.items():
+                scores[id] += math.log1p(frequency) * idf
+
+        candidates = (
+            (round(score, 6), id)
+            for id, score in scores.items()
+            if allowed is None or self._documents[id][0] in allowed
+        )
+        if after is not None:
+            candidates = (candidate for candidate in candidates if candidate < after)
+        return heapq.nlargest(limit, candidates)
+
+
+search_index = InvertedIndex(weights=SEARCH_WEIGHTS)
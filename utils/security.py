@@ -1,5 +1,6 @@
+import uuid
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Any, Literal, Optional
 
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
@@ -7,25 +8,41 @@ from jose import JWTError, jwt
 
 from config.settings import settings
 from models.users import User
+from utils.principal_cache import principal_cache
+from utils.revocation import revocation_list
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="users/access-token")
 
 
-def create_access_token(sub: str, expire_time_delta: Optional[datetime] = None) -> str:
-    if expire_time_delta:
-        expire = datetime.utcnow() + expire_time_delta
-    else:
-        expire = datetime.utcnow() + timedelta(
-            minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES
-        )
-    to_encode = {"sub": sub, "exp": expire}
+TokenType = Literal["access", "refresh"]
+
+
+def create_token(sub: str, token_type: TokenType, expire_time_delta: timedelta) -> str:
+    to_encode = {
+        "sub": sub,
+        "exp": datetime.utcnow() + expire_time_delta,
+        "jti": uuid.uuid4().hex,
+        "type": token_type,
+    }
     return jwt.encode(claims=to_encode, key=settings.JWT_SECRET_KEY, algorithm="HS256")
 
 
-async def get_current_user(token: str = Depends(oauth2_scheme)) -> User:
+def create_access_token(sub: str, expire_time_delta: Optional[datetime] = None) -> str:
+    if not expire_time_delta:
+        expire_time_delta = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
+    return create_token(sub, "access", expire_time_delta)
+
+
+def create_refresh_token(sub: str) -> str:
+    return create_token(
+        sub, "refresh", timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS)
+    )
+
+
+def decode_token(token: str, token_type: TokenType) -> dict[str, Any]:
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
-        detail="invalid access token",
+        detail=f"invalid {token_type} token",
         headers={"WWW-Authenticate": "Bearer"},
     )
     try:
@@ -34,11 +51,51 @@ async def get_current_user(token: str = Depends(oauth2_scheme)) -> User:
         )
     except JWTError:
         raise credentials_exception
-    email = payload.get("sub")
-    if not email:
+    if not payload.get("sub") or payload.get("type", "access") != token_type:
         raise credentials_exception
-
-    user = await User.get_user_by_email(email=email)
-    if not user:
+    jti = payload.get("jti")
+    if token_type == "refresh" and not jti:
+        raise credentials_exception
+    if jti and revocation_list.is_revoked(jti):
         raise credentials_exception
+    return payload
+
+
+async def revoke_token(payload: dict[str, Any]) -> bool:
+    if not payload.get("jti"):
+        return False
+    return await revocation_list.revoke(
+        payload["jti"], datetime.utcfromtimestamp(payload["exp"])
+    )
+
+
+async def get_current_user(token: str = Depends(oauth2_scheme)) -> User:
+    credentials_exception = HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="invalid access token",
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+    email = decode_token(token, "access")["sub"]
+
+    user = principal_cache.get(email)
+    if user is None:
+        user = await User.get_user_by_email(email=email)
+        if not user:
+            raise credentials_exception
+        principal_cache.set(email, user)
+    if not user.is_active:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="user is inactive",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
     return user
+
+
+def require_role(role: str, detail: str = "You are not authorized."):
+    async def role_checker(user: User = Depends(get_current_user)) -> User:
+        if user.role != role:
+            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail=detail)
+        return user
+
+    return role_checker
@@ -0,0 +1,38 @@
+from functools import lru_cache
+from typing import Any
+
+import orjson
+from bson import ObjectId
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel, TypeAdapter
+
+
+@lru_cache(maxsize=None)
+def list_adapter(model: type[BaseModel]) -> TypeAdapter:
+    return TypeAdapter(list[model])
+
+
+def default(obj: Any) -> Any:
+    if isinstance(obj, ObjectId):
+        return str(obj)
+    if isinstance(obj, BaseModel):
+        return obj.model_dump(mode="json", by_alias=True)
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+
+def dumps(content: Any) -> bytes:
+    if isinstance(content, BaseModel):
+        return content.__pydantic_serializer__.to_json(content, by_alias=True)
+    if (
+        isinstance(content, list)
+        and content
+        and isinstance(content[0], BaseModel)
+        and all(type(item) is type(content[0]) for item in content)
+    ):
+        return list_adapter(type(content[0])).dump_json(content, by_alias=True)
+    return orjson.dumps(content, default=default, option=orjson.OPT_NON_STR_KEYS)
+
+
+class ORJSONResponse(JSONResponse):
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
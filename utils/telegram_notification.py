@@ -1,18 +1,91 @@
-from telegram import Bot
-from telegram.error import TelegramError
-from telegram.parsemode import ParseMode
+import re
+from typing import Optional
+
+import httpx
 
 from config.settings import settings
 
-token = settings.TELEGRAM_TOKEN
+MARKDOWN_V2_SPECIAL = re.compile(r"([_*\[\]()~`>#+\-=|{}.!\\])")
+
+
+def escape_markdown(text: str) -> str:
+    if settings.TELEGRAM_PARSE_MODE != "MarkdownV2":
+        return text
+    return MARKDOWN_V2_SPECIAL.sub(r"\\\1", text)
+
+
+class DeliveryError(Exception):
+    def __init__(
+        self, message: str, *, retryable: bool, retry_after: Optional[float] = None
+    ) -> None:
+        super().__init__(message)
+        self.retryable = retryable
+        self.retry_after = retry_after
+
+
+class TelegramBackend:
+    def __init__(
+        self,
+        *,
+        token: str,
+        base_url: str = "https://api.telegram.org",
+        parse_mode: Optional[str] = "MarkdownV2",
+        timeout: float = 10.0,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+    ) -> None:
+        self.token = token
+        self.base_url = base_url
+        self.parse_mode = parse_mode
+        self.timeout = timeout
+        self.transport = transport
+        self._client: Optional[httpx.AsyncClient] = None
+
+    async def start(self) -> None:
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                base_url=self.base_url, timeout=self.timeout, transport=self.transport
+            )
 
-bot = Bot(token=token)
+    async def close(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
 
-chat_id = settings.TELEGRAM_CHAT_ID
+    async def send(self, chat_id: str, text: str) -> None:
+        await self.start()
+        payload = {"chat_id": chat_id, "text": text}
+        if self.parse_mode:
+            payload["parse_mode"] = self.parse_mode
+        try:
+            response = await self._client.post(
+                f"/bot{self.token}/sendMessage", json=payload
+            )
+        except httpx.HTTPError as e:
+            raise DeliveryError(str(e), retryable=True)
+        if response.status_code == 429:
+            try:
+                retry_after = response.json().get("parameters", {}).get("retry_after")
+            except (ValueError, AttributeError):
+                retry_after = response.headers.get("Retry-After")
+            try:
+                retry_after = float(retry_after) if retry_after else None
+            except ValueError:
+                retry_after = None
+            raise DeliveryError(
+                "rate limited by Telegram", retryable=True, retry_after=retry_after
+            )
+        if response.status_code >= 500:
+            raise DeliveryError(
+                f"Telegram returned {response.status_code}", retryable=True
+            )
+        if response.status_code >= 400:
+            raise DeliveryError(
+                f"Telegram rejected message: {response.text}", retryable=False
+            )
 
 
-def send_message(text: str) -> None:
-    try:
-        bot.send_message(chat_id=chat_id, text=text, parse_mode=ParseMode.MARKDOWN_V2)
-    except TelegramError as e:
-        print(e)
+telegram_backend = TelegramBackend(
+    token=settings.TELEGRAM_TOKEN,
+    base_url=settings.TELEGRAM_API_URL,
+    parse_mode=settings.TELEGRAM_PARSE_MODE,
+)
@@ -0,0 +1,225 @@
+import zlib
+from collections import Counter
+from typing import Any, AsyncIterator, Optional
+
+import orjson
+from beanie import PydanticObjectId
+from fastapi import HTTPException, status
+from pydantic import ValidationError
+from pymongo.errors import BulkWriteError
+
+from config.settings import settings
+from models.bugs import Bug
+from models.project_stats import ProjectStats
+from models.projects import Project
+from models.users import User
+from utils.consistency import iterate
+from utils.serialization import dumps
+
+GZIP_MAGIC = b"\x1f\x8b"
+DUPLICATE_KEY = 11000
+
+
+def export_line(kind: str, document: Any) -> bytes:
+    return b'{"kind":"%s","data":%s}\n' % (kind.encode(), dumps(document))
+
+
+async def export_project(
+    project: Project,
+    *,
+    user_id: PydanticObjectId,
+    chunk_size: int = 64 * 1024,
+    compresslevel: int = 6,
+) -> AsyncIterator[bytes]:
+    compressor = zlib.compressobj(compresslevel, zlib.DEFLATED, 31)
+    buffer = [compressor.compress(export_line("project", project))]
+    size = 0
+    async for bug in iterate(
+        Bug.find(Bug.project_id == project.id).sort(+Bug.created_at, +Bug.id),
+        user_id=user_id,
+    ):
+        data = compressor.compress(export_line("bug", bug))
+        if data:
+            buffer.append(data)
+            size += len(data)
+        if size >= chunk_size:
+            yield b"".join(buffer)
+            buffer, size = [], 0
+    buffer.append(compressor.flush())
+    yield b"".join(buffer)
+
+
+def invalid_export(detail: str) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_400_BAD_REQUEST, detail=f"Invalid export: {detail}"
+    )
+
+
+async def decompress(
+    chunks: AsyncIterator[bytes], max_length: int
+) -> AsyncIterator[bytes]:
+    decompressor = None
+    pending = b""
+    async for chunk in chunks:
+        if decompressor is None:
+            pending += chunk
+            if len(pending) < len(GZIP_MAGIC):
+                continue
+            if not pending.startswith(GZIP_MAGIC):
+                decompressor = False
+            else:
+                decompressor = zlib.decompressobj(31)
+            chunk, pending = pending, b""
+        if not decompressor:
+            yield chunk
+            continue
+        try:
+            while not decompressor.eof:
+                data = decompressor.decompress(chunk, max_length)
+                yield data
+                chunk = decompressor.unconsumed_tail
+                if not chunk and len(data) < max_length:
+                    break
+        except zlib.error:
+            raise invalid_export("corrupt gzip stream")
+    if pending:
+        yield pending
+    if decompressor and not decompressor.eof:
+        raise invalid_export("truncated gzip stream")
+
+
+async def read_lines(
+    chunks: AsyncIterator[bytes], max_line_bytes: int
+) -> AsyncIterator[bytes]:
+    pending = b""
+    async for chunk in decompress(chunks, max_line_bytes):
+        *lines, pending = (pending + chunk).split(b"\n")
+        for line in lines:
+            if len(line) > max_line_bytes:
+                raise invalid_export("line too long")
+            if line.strip():
+                yield line
+        if len(pending) > max_line_bytes:
+            raise invalid_export("line too long")
+    if pending.strip():
+        yield pending
+
+
+class ProjectImport:
+    def __init__(
+        self,
+        user_id: PydanticObjectId,
+        *,
+        batch_size: int = 1000,
+        max_line_bytes: int = 1024 * 1024,
+    ) -> None:
+        self.user_id = user_id
+        self.batch_size = batch_size
+        self.max_line_bytes = max_line_bytes
+        self.project: Optional[Project] = None
+        self.imported = 0
+        self.skipped = 0
+        self.unknown_assignees = 0
+        self.counts: Counter = Counter()
+
+    async def run(self, chunks: AsyncIterator[bytes]) -> Project:
+        try:
+            await self.read(chunks)
+        except Exception:
+            if self.project is not None:
+                await self.finish(reconcile=True)
+            raise
+        await self.finish(reconcile=self.skipped > 0)
+        return self.project
+
+    async def read(self, chunks: AsyncIterator[bytes]) -> None:
+        batch: list[Bug] = []
+        lineno = 0
+        async for line in read_lines(chunks, self.max_line_bytes):
+            lineno += 1
+            try:
+                record = orjson.loads(line)
+                kind, data = record["kind"], record["data"]
+            except (orjson.JSONDecodeError, KeyError, TypeError):
+                raise invalid_export(f"malformed record on line {lineno}")
+            if kind == "project":
+                if self.project is not None:
+                    raise invalid_export("more than one project record")
+                await self.create_project(data)
+            elif kind == "bug":
+                if self.project is None:
+                    raise invalid_export("bug record before the project record")
+                batch.append(self.parse_bug(data, lineno))
+                if len(batch) >= self.batch_size:
+                    await self.insert(batch)
+                    batch = []
+            else:
+                raise invalid_export(f"unknown record kind {kind!r}")
+        if self.project is None:
+            raise invalid_export("missing project record")
+        if batch:
+            await self.insert(batch)
+
+    async def create_project(self, data: dict) -> None:
+        try:
+            project = Project.model_validate({**data, "created_by": self.user_id})
+        except ValidationError:
+            raise invalid_export("invalid project record")
+        project.deleted_at = None
+        existing = await Project.get(project.id)
+        if existing is None:
+            await project.insert()
+        elif existing.created_by != self.user_id or existing.deleted_at is not None:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="Project already exists.",
+            )
+        else:
+            project = existing
+        self.project = project
+
+    def parse_bug(self, data: dict, lineno: int) -> Bug:
+        try:
+            bug = Bug.model_validate(data)
+        except ValidationError:
+            raise invalid_export(f"invalid bug record on line {lineno}")
+        bug.project_id = self.project.id
+        bug.created_by = self.user_id
+        return bug
+
+    async def drop_unknown_assignees(self, batch: list[Bug]) -> None:
+        missing = set(
+            await User.missing_ids(id for bug in batch for id in bug.assigned_to)
+        )
+        if not missing:
+            return
+        for bug in batch:
+            assigned_to = [id for id in bug.assigned_to if id not in missing]
+            self.unknown_assignees += len(bug.assigned_to) - len(assigned_to)
+            bug.assigned_to = assigned_to
+
+    async def insert(self, batch: list[Bug]) -> None:
+        await self.drop_unknown_assignees(batch)
+        failed = set()
+        try:
+            await Bug.insert_many(batch, ordered=False)
+        except BulkWriteError as e:
+            for error in e.details["writeErrors"]:
+                if error["code"] != DUPLICATE_KEY:
+                    raise
+                failed.add(error["index"])
+        for index, bug in enumerate(batch):
+            if index in failed:
+                continue
+            bug.index_for_search()
+            self.counts[(bug.project_id, bug.status, bug.severity)] += 1
+        self.imported += len(batch) - len(failed)
+        self.skipped += len(failed)
+
+    async def finish(self, *, reconcile: bool) -> None:
+        if reconcile:
+            await ProjectStats.reconcile(self.project.id)
+        else:
+            await ProjectStats.apply(self.counts)
+        if settings.BUG_DETAIL_READ_MODEL:
+            await Bug.refresh_details({"project_id": self.project.id})